@@ -15,6 +15,7 @@ from youpy.engine import Engine
 from youpy.script import get_scene
 from youpy.script import get_mouse
 from youpy.script import send_request
+from youpy.script import post_request
 from youpy.script import StopScript
 from youpy.script import get_script_logger
 from youpy.script import get_context_script
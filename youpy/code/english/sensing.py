@@ -27,6 +27,7 @@ Mouse = MouseType()
 sprite_functions = (
     "touched_objects",
     "touching",
+    "touching_each",
     )
 
 for name in sprite_functions:
@@ -8,6 +8,7 @@ import argparse
 from youpy.cli.argparse import ArgparseFormatter
 from youpy.cli.argparse import parse_cli_args
 from youpy.runner import run
+from youpy.physics import PhysicalEngine
 from youpy.project import InvalidProjectDir
 from youpy import logging
 
@@ -22,6 +23,15 @@ def mkcli():
             raise argparse.ArgumentTypeError(
                 "invalid log level '{}' (pick one in {})"
                 .format(text, ", ".join(logging.STR2LEVEL.keys())))
+    def positive_float(text):
+        try:
+            value = float(text)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid float value '{text}'")
+        if value <= 0:
+            raise argparse.ArgumentTypeError(
+                f"must be strictly positive, not {value}")
+        return value
     parser = argparse.ArgumentParser(
         prog=PROGNAME,
         description=__doc__,
@@ -41,6 +51,58 @@ def mkcli():
         type=int,
         default=30, # Scratch's FPS according to my experiment.
         help="Refresh rate of the simulation.")
+    parser.add_argument(
+        "--fixed-fps",
+        dest="adaptive_fps",
+        action="store_false",
+        help="Keep the refresh rate even when the engine is overloaded "\
+        "instead of lowering it.")
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Run without opening any window (render offscreen).")
+    parser.add_argument(
+        "--no-throttle",
+        dest="throttle",
+        action="store_false",
+        help="Run the simulation as fast as possible instead of pacing it "\
+        "to the wall-clock.")
+    parser.add_argument(
+        "--time-limit",
+        action="store",
+        type=float,
+        default=None,
+        help="Stop the program after this amount of simulated seconds.")
+    parser.add_argument(
+        "--render-thread",
+        action="store_true",
+        help="Compose frames in a separate thread so that rendering does "\
+        "not delay the scripts. They are still presented by the main "\
+        "thread, one frame later.")
+    parser.add_argument(
+        "--physics-step",
+        action="store",
+        type=positive_float,
+        default=PhysicalEngine.DEFAULT_DELTA_TIME,
+        help="Duration in seconds of one physics simulation step.")
+    parser.add_argument(
+        "--vectorized-physics",
+        action="store_true",
+        help="Advance all sprite moves at once with NumPy (must be "\
+        "installed). Faster when many sprites glide at the same time.")
+    parser.add_argument(
+        "--interpolate",
+        action="store_true",
+        help="Display moving sprites between their last two physics "\
+        "positions to keep motion smooth with a coarse physics step.")
+    parser.add_argument(
+        "--profile",
+        action="store",
+        metavar="FILE",
+        default=None,
+        help="Record the duration of each phase of the last frames, show "\
+        "them under the FPS and save them to FILE at exit (JSON if it ends "\
+        "with .json, CSV otherwise).")
     parser.add_argument(
         "--log-level",
         action="store",
@@ -64,6 +126,11 @@ def main(argv, opts):
     opts, _ = parse_cli_args(mkcli(), argv[1:], opts)
     try:
         run(opts.project_dir, show_fps=opts.show_fps, fps=opts.fps,
+            headless=opts.headless, throttle=opts.throttle,
+            time_limit=opts.time_limit, render_thread=opts.render_thread,
+            interpolate=opts.interpolate, physics_step=opts.physics_step,
+            vectorized_physics=opts.vectorized_physics,
+            adaptive_fps=opts.adaptive_fps, profile=opts.profile,
             log_level=opts.log_level, syslog_level=opts.syslog_level,
             log_context=opts.log_context)
         return 0
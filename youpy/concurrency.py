@@ -15,18 +15,56 @@ import queue as _queue
 Task = _concurrency.Thread
 Queue = _queue.Queue
 EmptyQueue = _queue.Empty
+Event = _concurrency.Event
+Lock = _concurrency.Lock
 
 def get_context():
     return _concurrency.local()
 
 class Pipe:
+    """Channel between a client and a server.
+
+    Several pipes may share the same _request_queue_ so that the server
+    collects all requests from a single place, while each pipe receives its
+    replies on its own queue.
+    """
 
     MAXSIZE = 10
 
-    def __init__(self):
-        self.request_queue = Queue(maxsize=self.MAXSIZE)
+    def __init__(self, request_queue=None):
+        if request_queue is None:
+            request_queue = Queue(maxsize=self.MAXSIZE)
+        self.request_queue = request_queue
         self.reply_queue = Queue(maxsize=self.MAXSIZE)
 
+class Mailbox:
+    """Single-slot channel holding only the latest item.
+
+    Putting an item replaces the one not taken yet, thus a slow consumer
+    never makes the producer wait and only sees the most recent item.
+    """
+
+    def __init__(self):
+        self._ready = _concurrency.Condition(_concurrency.Lock())
+        self._item = None
+        self._is_full = False
+
+    def put(self, item):
+        with self._ready:
+            self._item = item
+            self._is_full = True
+            self._ready.notify()
+
+    def get(self):
+        """Return the latest item put, waiting for one if needed."""
+        with self._ready:
+            while not self._is_full:
+                self._ready.wait()
+            item = self._item
+            self._item = None
+            self._is_full = False
+            return item
+
 # Copied from https://www.oreilly.com/library/view/python-cookbook/0596001673/ch06s04.html
 class ReadWriteLock:
     """Lock allowing shared read access but exclusive write access.
@@ -88,3 +88,11 @@ class Configurer:
         visible = cfg.get("visible", None)
         if visible is not None:
             sprite.visible = visible
+        rotation_style = cfg.get("rotation_style")
+        if rotation_style is not None:
+            try:
+                sprite.rotation_style = rotation_style
+            except ValueError:
+                raise ConfigError(
+                    f"invalid rotation style for sprite '{sprite.name}': "
+                    f"'{rotation_style}'")
@@ -6,6 +6,7 @@ import os
 import re
 from pathlib import Path
 from collections import OrderedDict
+from typing import NamedTuple
 
 import pygame
 
@@ -61,12 +62,115 @@ class Image:
         self.name = mo.group("name")
         self.index = mo.group("index")
         self.index = 0 if self.index is None else int(self.index)
-        self.surface = pygame.image.load(os.fspath(self.path))
+        self.surface = to_display_format(
+            pygame.image.load(os.fspath(self.path)))
+
+    @property
+    def surface(self):
+        return self._surface
+
+    @surface.setter
+    def surface(self, surface):
+        self._surface = surface
+        self._mask = None
 
     @property
     def rect(self):
         return self.surface.get_rect()
 
+    @property
+    def mask(self):
+        """Mask of the opaque pixels of the image.
+
+        Computed once and kept until the surface changes.
+        """
+        if self._mask is None:
+            self._mask = pygame.mask.from_surface(self._surface)
+        return self._mask
+
+class TransformedImage:
+    """Image transformed for display (eg. rotated) with its mask and rect."""
+
+    __slots__ = ("surface", "rect", "_mask")
+
+    def __init__(self, surface):
+        self.surface = surface
+        self.rect = surface.get_rect()
+        self._mask = None
+
+    @property
+    def mask(self):
+        if self._mask is None:
+            self._mask = pygame.mask.from_surface(self.surface)
+        return self._mask
+
+class TransformCache:
+    """Bounded LRU cache of transformed images.
+
+    Entries are keyed by the image's surface, so that they are not used
+    anymore once the image is scaled, and by the transformation.
+    """
+
+    DEFAULT_MAXSIZE = 1024
+
+    # Angles are rounded to this step (in degree) before rotation.
+    ANGLE_STEP = 1
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+
+    @classmethod
+    def quantize_angle(cls, angle):
+        return round(angle / cls.ANGLE_STEP) * cls.ANGLE_STEP % 360
+
+    def rotated(self, image, angle):
+        """Return _image_ rotated counter-clockwise by _angle_ degree."""
+        angle = self.quantize_angle(angle)
+        surface = image.surface
+        return self._get((surface, "rotate", angle),
+                         lambda: pygame.transform.rotate(surface, angle))
+
+    def flipped(self, image):
+        """Return _image_ flipped horizontally."""
+        surface = image.surface
+        return self._get((surface, "flip"),
+                         lambda: pygame.transform.flip(surface, True, False))
+
+    def _get(self, key, transform):
+        try:
+            entry = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            entry = self._entries[key] = TransformedImage(transform())
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return entry
+
+def to_display_format(surface):
+    """Return _surface_ converted to the pixel format of the display.
+
+    Blitting such a surface does not need any per-pixel conversion.
+    Per-pixel alpha is preserved. Return _surface_ unchanged when no display
+    mode has been set yet.
+    """
+    if pygame.display.get_surface() is None:
+        return surface
+    if surface.get_flags() & pygame.SRCALPHA:
+        return surface.convert_alpha()
+    return surface.convert()
+
 def scale_image_by(image, ratio=None):
     """
     Operate in place!
@@ -77,6 +181,26 @@ def scale_image_by(image, ratio=None):
     size = scale_size_by(image.rect.size, ratio)
     image.surface = pygame.transform.scale(image.surface, size)
 
+class SpriteState(NamedTuple):
+    """Immutable snapshot of an EngineSprite's state.
+
+    Coordinates are in the native (top-left) coordinate system.
+    """
+
+    version: int
+    visible: bool
+    x: float
+    y: float
+    direction: int
+    left: int
+    top: int
+    right: int
+    bottom: int
+
+    @property
+    def position(self):
+        return (self.x, self.y)
+
 class EngineSprite:
     """Hold the data of a Sprite as used internally by the engine.
 
@@ -85,6 +209,11 @@ class EngineSprite:
     it is modified).
     """
 
+    ALL_AROUND = "all around"
+    LEFT_RIGHT = "left-right"
+    DONT_ROTATE = "don't rotate"
+    ROTATION_STYLES = (ALL_AROUND, LEFT_RIGHT, DONT_ROTATE)
+
     def __init__(self, path, coordsys_name="center", scene=None):
         self._path = Path(path)
         assert self._path.is_dir()
@@ -98,6 +227,14 @@ class EngineSprite:
         self._rect = None
         self._visible = True
         self._direction = 0 # direction angle in degree
+        self._rotation_style = self.DONT_ROTATE
+        # Incremented at every change.
+        self._version = 0
+        # Last snapshot returned by get_state(). Reset to None when the sprite
+        # changes.
+        self._state = None
+        # Notified of every change by calling its sprite_changed() method.
+        self.observer = None
 
     @property
     def path(self):
@@ -123,6 +260,18 @@ class EngineSprite:
     @rect.setter
     def rect(self, new_rect):
         self._rect = new_rect
+        self._changed()
+
+    def _changed(self):
+        """Must be called after any change of the sprite's state."""
+        self._version += 1
+        self._state = None
+        if self.observer is not None:
+            self.observer.sprite_changed(self)
+
+    @property
+    def version(self):
+        return self._version
 
     def go_to(self, x, y):
         p = self._position
@@ -133,10 +282,27 @@ class EngineSprite:
         self._position.x = x
         self._position.y = y
         self._update_rect_position()
+        self._changed()
+
+    def glide_to(self, x, y):
+        """Fast path of go_to() for the physics engine.
+
+        Update the position and the rect in place, without allocating any
+        object. Return the new version of the sprite.
+        """
+        p = self._position
+        p.x = x
+        p.y = y
+        anchor_x, anchor_y = self.scene.coordsys.RECT_ANCHOR
+        setattr(self._rect, anchor_x, math.discretize(x))
+        setattr(self._rect, anchor_y, math.discretize(y))
+        self._changed()
+        return self._version
 
     def go_to_position(self, position):
         self._position = position
         self._update_rect_position()
+        self._changed()
 
     def _update_rect_position(self):
         self.scene.coordsys.set_rect_position(self._rect, self._position)
@@ -149,11 +315,53 @@ class EngineSprite:
     def current_image(self):
         return self.images[self._index]
 
+    @property
+    def displayed_image(self):
+        """Current image as rendered according to the rotation style."""
+        image = self.current_image
+        style = self._rotation_style
+        if style == self.DONT_ROTATE:
+            return image
+        if style == self.ALL_AROUND:
+            if self._direction == 0:
+                return image
+            return self.scene.transform_cache.rotated(image, self._direction)
+        if 90 < self._direction % 360 < 270: # facing left
+            return self.scene.transform_cache.flipped(image)
+        return image
+
+    @property
+    def surface(self):
+        return self.displayed_image.surface
+
+    @property
+    def mask(self):
+        return self.displayed_image.mask
+
+    @property
+    def rotation_style(self):
+        return self._rotation_style
+
+    @rotation_style.setter
+    def rotation_style(self, style):
+        if style not in self.ROTATION_STYLES:
+            raise ValueError(f"invalid rotation style: '{style}'")
+        self._rotation_style = style
+        self._update_rect_size()
+        self._changed()
+
+    def _update_rect_size(self):
+        """Fit the rect to the displayed image (rotated images are larger)."""
+        size = self.displayed_image.rect.size
+        if self._rect.size != size:
+            self._rect.size = size
+            self._update_rect_position()
+
     def show(self):
-        self._visible = True
+        self.visible = True
 
     def hide(self):
-        self._visible = False
+        self.visible = False
 
     @property
     def visible(self):
@@ -162,15 +370,23 @@ class EngineSprite:
     @visible.setter
     def visible(self, visible):
         self._visible = visible
+        self._changed()
 
     def point_in_direction(self, angle):
         self._direction = angle
+        self._direction_changed()
 
     def direction(self):
         return self._direction
 
     def turn_counter_clockwise(self, angle):
         self._direction = self.scene.anglesys.inc_angle(self._direction, angle)
+        self._direction_changed()
+
+    def _direction_changed(self):
+        if self._rotation_style != self.DONT_ROTATE:
+            self._update_rect_size()
+        self._changed()
 
     def move_by(self, step_x, step_y):
         self.go_to(self._position.x + step_x, self._position.y + step_y)
@@ -182,12 +398,27 @@ class EngineSprite:
         return self.scene.coordsys.vector_from(Point.toward(self._direction))
 
     def get_state(self):
-        class State:
-            visible = self._visible
-            rect = self._rect.copy()
-            position = self._position.copy()
-            direction = self.direction()
-        return State()
+        """Return a snapshot of the sprite's state.
+
+        The snapshot is shared and kept until the sprite changes. Thus, it
+        must not be modified.
+        """
+        if self._state is None:
+            r = self._rect
+            p = self._position
+            self._state = SpriteState(self._version, self._visible,
+                                      p.x, p.y, self._direction,
+                                      r.left, r.top, r.right, r.bottom)
+        return self._state
+
+    @property
+    def state(self):
+        """Last snapshot returned by get_state() or None if it is outdated.
+
+        The engine publishes it after each simulation step (see
+        SpritesList.publish_states). May be read concurrently.
+        """
+        return self._state
 
 def scale_sprite_by(sprite, ratio=None):
     """
@@ -195,7 +426,8 @@ def scale_sprite_by(sprite, ratio=None):
     """
     for image in sprite.images:
         scale_image_by(image, ratio=ratio)
-    sprite.rect.size = sprite.current_image.rect.size
+    sprite.rect.size = sprite.displayed_image.rect.size
+    sprite._changed()
 
 class EngineScene:
     """Internal scene representation."""
@@ -212,8 +444,13 @@ class EngineScene:
         self.surface = None
         self.backdrops = OrderedDict() # important to support "next backdrop"
         self._backdrop = None
+        # Notified of every backdrop switch by calling its backdrop_switched()
+        # method.
+        self.observer = None
         self.coordsys = None # set at configuration time
         self.anglesys = None # set at configuration time
+        # Shared by all sprites.
+        self.transform_cache = TransformCache()
 
     @property
     def size(self):
@@ -238,6 +475,8 @@ class EngineScene:
     @backdrop.setter
     def backdrop(self, backdrop):
         self._backdrop = self.backdrops[backdrop]
+        if self.observer is not None:
+            self.observer.backdrop_switched()
 
 class EngineMouse:
 
@@ -5,13 +5,19 @@
 
 from collections import OrderedDict
 from collections import Counter
+from collections import deque
+from operator import attrgetter
 from collections.abc import Sequence
 from abc import ABC
 from abc import abstractmethod
 from dataclasses import dataclass
 from typing import Any
+from typing import NamedTuple
+from typing import Optional
 from time import time
-from time import sleep
+import os
+import sys
+import heapq
 
 import pygame
 
@@ -28,12 +34,15 @@ from youpy.script import ScriptSet
 from youpy.script import set_scene
 from youpy.script import set_mouse
 from youpy import message
-from youpy.concurrency import EmptyQueue
 from youpy.keys import iter_keys
 from youpy.keys import check_key
 from youpy import math
 from youpy.shared_variables import SharedVariableSet
 from youpy import physics
+from youpy import concurrency
+from youpy.spatial import UniformGrid
+from youpy.profiler import FrameProfiler
+from youpy.profiler import NullProfiler
 
 
 from youpy import logging
@@ -64,72 +73,195 @@ class LoggerProgress:
         # are repeated.
         self._count.clear()
 
+class TextCache:
+    """Bounded LRU cache of text surfaces rendered with _font_.
+
+    HUD items display a small set of strings over and over (eg. a score, a
+    frame rate), thus rasterizing them once is enough.
+    """
+
+    DEFAULT_MAXSIZE = 256
+
+    def __init__(self, font, color=Color.white, maxsize=DEFAULT_MAXSIZE):
+        self.font = font
+        self.color = color
+        self.maxsize = maxsize
+        self._surfaces = OrderedDict()
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def render(self, text):
+        """Return the surface of _text_. It is shared and must not be
+        modified.
+        """
+        try:
+            surface = self._surfaces[text]
+        except KeyError:
+            surface = self._surfaces[text] = self.font.render(
+                text, True, self.color._c)
+            if len(self._surfaces) > self.maxsize:
+                self._surfaces.popitem(last=False)
+        else:
+            self._surfaces.move_to_end(text)
+        return surface
+
+def render_panels(surface, panels, area=None):
+    """Render HUD _panels_ on _surface_.
+
+    A panel is a (rect, blits) pair: its rect is cleared to black and its
+    blits are (surface, position) pairs drawn over it.
+    """
+    for rect, blits in panels:
+        if area is not None and not area.colliderect(rect):
+            continue
+        surface.fill(Color.black._c, rect)
+        surface.blits(blits, doreturn=False)
+
 class FPSRenderer:
 
     def __init__(self, fps, simu):
         self.fps = fps
         self.simu = simu
+        self._rect = None
 
     def update(self):
-        self._surf = self.simu.default_font.render(
-            f'{self.fps.frequency: 3.0f}', True, Color.white._c)
+        """Return the rects to redraw."""
+        old_rect = self._rect
+        self._surf = self.simu.text_cache.render(
+            f'{self.fps.frequency: 3.0f}')
         self._rect = self._surf.get_rect().copy()
         self._rect.topleft = (self.simu.scene.width - self._rect.width, 0)
         print("FPS:", self.fps)
+        return [self._rect] if old_rect is None else [old_rect, self._rect]
+
+    @property
+    def is_outdated(self):
+        return self.fps.is_outdated
 
-    def render(self):
-        self.simu.scene.surface.fill(Color.black._c, self._rect)
-        self.simu.scene.surface.blit(self._surf, self._rect)
+    def panels(self):
+        if self._rect is None:
+            return []
+        return [(self._rect, ((self._surf, self._rect.topleft),))]
 
-class DummyFPSRenderer:
+    def render(self, area=None):
+        render_panels(self.simu.scene.surface, self.panels(), area)
+
+class DummyHUDRenderer:
+
+    is_outdated = False
 
     def update(self):
-        pass
+        return []
+
+    def panels(self):
+        return []
 
-    def render(self):
+    def render(self, area=None):
         pass
 
+class ProfilerRenderer:
+    """Show the average duration of each frame phase under the FPS."""
+
+    PERIOD = 1.0 # seconds between two updates
+    AVERAGED_FRAMES = 30
+
+    def __init__(self, profiler, simu):
+        self.profiler = profiler
+        self.simu = simu
+        self._panels = []
+        self._updated_at = 0
+
+    @property
+    def is_outdated(self):
+        return time() - self._updated_at > self.PERIOD
+
+    def update(self):
+        """Return the rects to redraw."""
+        if not self.is_outdated:
+            return []
+        self._updated_at = time()
+        dirty_rects = [rect for rect, _ in self._panels]
+        averages = self.profiler.averages(count=self.AVERAGED_FRAMES)
+        width = self.simu.scene.width
+        top = self.simu.default_font.get_linesize() # under the FPS
+        self._panels = []
+        for phase, duration in averages.items():
+            surface = self.simu.text_cache.render(
+                f"{phase} {duration * 1000:6.2f}ms")
+            rect = surface.get_rect(topright=(width, top))
+            top += rect.height
+            self._panels.append((rect, ((surface, rect.topleft),)))
+        dirty_rects.extend(rect for rect, _ in self._panels)
+        return dirty_rects
+
+    def panels(self):
+        return self._panels
+
+    def render(self, area=None):
+        render_panels(self.simu.scene.surface, self._panels, area)
+
 class SharedVariablesRenderer:
 
     @dataclass
     class State:
         name: str
         value: Any
-        surface: pygame.Surface
+        label: pygame.Surface # "name = "
+        value_surface: pygame.Surface
         rect: pygame.Rect
 
     def __init__(self, simu):
         self.simu = simu
         self._states = OrderedDict()
 
-    def render(self, shared_variables):
-        if shared_variables.has_changed:
-            self._update(shared_variables)
-            shared_variables.clear_change_flag()
-        for state in self._states.values():
-            self.simu.scene.surface.fill(Color.black._c, state.rect)
-            self.simu.scene.surface.blit(state.surface, state.rect)
+    def update(self, shared_variables):
+        """Return the rects to redraw."""
+        if not shared_variables.has_changed:
+            return []
+        # Cleared first so that a change made while reading the variables
+        # is rendered at the next frame.
+        shared_variables.clear_change_flag()
+        dirty_rects = [state.rect.copy() for state in self._states.values()]
+        self._update(shared_variables)
+        dirty_rects.extend(state.rect for state in self._states.values())
+        return dirty_rects
+
+    def panels(self):
+        return [(state.rect,
+                 ((state.label, state.rect.topleft),
+                  (state.value_surface,
+                   (state.rect.left + state.label.get_width(),
+                    state.rect.top))))
+                for state in self._states.values()]
+
+    def render(self, area=None):
+        render_panels(self.simu.scene.surface, self.panels(), area)
 
     def _update(self, shared_variables):
+        # Panels are composed of a label and a value rendered separately so
+        # that both are reused from the text cache.
+        text_cache = self.simu.text_cache
         update_rect = False
         for name in shared_variables:
             var = shared_variables[name]
             state = self._states.get(name, None)
             if var._visible:
+                value = var.get()
                 if state is None:
-                    state = self.State(name=name, value=None,
-                                       surface=None, rect=None)
+                    state = self.State(name=name, value=value,
+                                       label=text_cache.render(f"{name} = "),
+                                       value_surface=text_cache.render(
+                                           f"{value}"),
+                                       rect=None)
                     self._states[name] = state
                     update_rect = True
-                else:
-                    pass
-                if state.value != var.get():
-                    state.value = var.get()
-                    state.surface = self.simu.default_font.render(
-                        f"{state.name} = {state.value}", True, Color.white._c)
-                    if state.rect is not None:
-                        state.rect.width = state.surface.get_rect().width
-                        assert state.rect.height == state.surface.get_rect().height
+                elif state.value != value:
+                    state.value = value
+                    state.value_surface = text_cache.render(f"{value}")
+                    state.rect.width = state.label.get_width() \
+                        + state.value_surface.get_width()
+                    assert state.rect.height == state.value_surface.get_height()
             else:
                 if state is None:
                     pass
@@ -139,25 +271,336 @@ class SharedVariablesRenderer:
         if update_rect:
             top = 0
             for state in self._states.values():
-                state.rect = state.surface.get_rect().copy()
-                state.rect.top = top
+                state.rect = pygame.Rect(
+                    0, top,
+                    state.label.get_width() + state.value_surface.get_width(),
+                    state.label.get_height())
                 top += state.rect.height
 
+class FrameSnapshot(NamedTuple):
+    """Immutable description of a frame.
+
+    Surfaces are shared with the simulation, which never modifies them in
+    place, whereas rects are copies.
+    """
+
+    backdrop: Optional[pygame.Surface] # None for a black background
+    sprites: tuple # (surface, rect) pairs, back to front
+    panels: tuple # HUD panels (see render_panels())
+
+    def draw(self, surface):
+        if self.backdrop is None:
+            surface.fill(Color.black._c)
+        else:
+            surface.blit(self.backdrop, (0, 0))
+        surface.blits(self.sprites, doreturn=False)
+        render_panels(surface, self.panels)
+
+class RenderThread:
+    """Compose the frame snapshots published by the simulation offscreen.
+
+    The thread only draws into its own surfaces: SDL video calls are not
+    thread-safe, so the main thread takes the composed frames and blits
+    and presents them itself (see take_frame()).
+
+    Only the latest snapshot is drawn: those published while a frame is
+    being drawn replace each other. Frames are triple-buffered so that
+    neither thread waits for the other: the thread draws into a back
+    buffer, swapped with the ready one when done, and the main thread
+    swaps the ready buffer with the front one it blits from.
+    """
+
+    def __init__(self, surface):
+        """
+        Parameters:
+        - surface: display surface. The frames have its size and format.
+        """
+        self._back, self._ready, self._front = (
+            pygame.Surface(surface.get_size(), 0, surface) for _ in range(3))
+        self._swap_lock = concurrency.Lock()
+        self._has_frame = False
+        self._mailbox = concurrency.Mailbox()
+        self._task = concurrency.Task(target=self._run, name="render",
+                                      daemon=True)
+        self._last_published = None
+        self._error = None
+        self.drawn_count = 0
+
+    def start(self):
+        self._task.start()
+
+    def publish(self, snapshot):
+        self._check()
+        self._last_published = snapshot
+        self._mailbox.put(snapshot)
+
+    @property
+    def error(self):
+        """Exception that stopped the thread, if any."""
+        return self._error
+
+    @property
+    def has_frame(self):
+        """Whether a composed frame has not been taken yet."""
+        return self._has_frame
+
+    def take_frame(self):
+        """Return the latest composed frame not taken yet, or None.
+
+        The returned surface is only valid until the next call.
+        """
+        self._check()
+        with self._swap_lock:
+            if not self._has_frame:
+                return None
+            self._front, self._ready = self._ready, self._front
+            self._has_frame = False
+        return self._front
+
+    def stop(self):
+        """Wait for the last published snapshot to be drawn and stop."""
+        self._mailbox.put(None)
+        self._task.join()
+
+    def _check(self):
+        if self._error is not None:
+            raise RuntimeError("render thread failed") from self._error
+
+    def _run(self):
+        try:
+            drawn = None
+            while True:
+                snapshot = self._mailbox.get()
+                if snapshot is None:
+                    # Stopping replaces the last published snapshot in the
+                    # mailbox if it was not taken out yet.
+                    if self._last_published is not drawn:
+                        self._draw(self._last_published)
+                    return
+                self._draw(snapshot)
+                drawn = snapshot
+        except Exception as e:
+            self._error = e
+
+    def _draw(self, snapshot):
+        snapshot.draw(self._back)
+        with self._swap_lock:
+            self._back, self._ready = self._ready, self._back
+            self._has_frame = True
+        self.drawn_count += 1
+
 class Renderer:
+    """Render the scene.
+
+    Only the areas that changed since the previous frame are redrawn: the
+    previous and current rects of the sprites that changed and of the
+    HUD (shared variables and FPS) items that changed.
+
+    When given an interpolation factor, sprites moved by the last physics
+    step are displayed between their previous and current positions, so
+    that motion stays smooth even if physics runs at a lower rate than
+    rendering.
+    """
+
+    # Beyond these limits, redrawing the whole scene is cheaper.
+    MAX_DIRTY_RECTS = 32
+    MAX_DIRTY_AREA_RATIO = 0.5
 
     def __init__(self, simu, show_fps=False):
         self.simu = simu
         self.fps = FrequencyMeter()
-        self._fps_renderer = FPSRenderer(self.fps, simu) if show_fps else DummyFPSRenderer()
+        self._fps_renderer = FPSRenderer(self.fps, simu) if show_fps else DummyHUDRenderer()
+        if simu.profiler.enabled:
+            self._profiler_renderer = ProfilerRenderer(simu.profiler, simu)
+        else:
+            self._profiler_renderer = DummyHUDRenderer()
         self._shared_variables_renderer = SharedVariablesRenderer(self.simu)
+        # Rect of each sprite as drawn on the previous frame.
+        self._drawn = {}
+        # Interpolated rect of the sprites displayed elsewhere than at their
+        # rect in the current frame.
+        self._displayed = {}
+        self._full_redraw = True
+        self._updated_rects = None
+
+    @property
+    def updated_rects(self):
+        """Areas updated by the last render, or None for the whole scene."""
+        return self._updated_rects
+
+    def invalidate(self):
+        """Force the next render to redraw the whole scene."""
+        self._full_redraw = True
+
+    @property
+    def is_outdated(self):
+        """Whether something must be rendered regardless of the journal."""
+        # Interpolated sprites are displayed at a new position every frame
+        # until they reach their rect.
+        return self._full_redraw or self._fps_renderer.is_outdated \
+            or self._profiler_renderer.is_outdated or bool(self._displayed)
+
+    def render(self, alpha=None):
+        """Render the current frame.
+
+        _alpha_ is the fraction of physics step elapsed since the last one
+        used to interpolate moving sprites' position, or None to display
+        them at their current position.
+        """
+        scene = self.simu.scene
+        sprites = self.simu.sprites
+        journal = self.simu.journal
+        displayed = self._interpolate(alpha)
+        changed = journal.changed_sprites
+        if displayed or self._displayed:
+            changed = changed.union(displayed, self._displayed)
+        self._displayed = displayed
+        dirty_rects = self._shared_variables_renderer.update(
+            self.simu.shared_variables)
+        if self.fps.update():
+            dirty_rects.extend(self._fps_renderer.update())
+        dirty_rects.extend(self._profiler_renderer.update())
+        if self._full_redraw or journal.backdrop_changed:
+            dirty_rects = None
+        else:
+            for sprite in changed:
+                drawn_rect = self._drawn.get(sprite)
+                if drawn_rect is not None:
+                    dirty_rects.append(drawn_rect)
+                if sprite.visible:
+                    dirty_rects.append(self._rect_of(sprite))
+            dirty_rects = self._merge_rects(scene, dirty_rects)
+        if dirty_rects is None:
+            self._render_all(scene, sprites)
+        else:
+            for area in dirty_rects:
+                self._render_area(scene, sprites, area)
+            for sprite in changed:
+                self._record_drawn(sprite)
+        self._updated_rects = dirty_rects
+        journal.clear()
+
+    def snapshot(self, alpha=None):
+        """Return a snapshot of the current frame.
 
-    def render(self):
-        self._render_scene(self.simu.scene)
-        self._render_sprites(self.simu.scene, self.simu.sprites)
-        self._shared_variables_renderer.render(self.simu.shared_variables)
+        Used instead of render() when frames are drawn by a RenderThread.
+        """
+        scene = self.simu.scene
+        self._displayed = self._interpolate(alpha)
+        self._shared_variables_renderer.update(self.simu.shared_variables)
         if self.fps.update():
             self._fps_renderer.update()
+        self._profiler_renderer.update()
+        panels = self._shared_variables_renderer.panels() \
+            + self._fps_renderer.panels() + self._profiler_renderer.panels()
+        snapshot = FrameSnapshot(
+            backdrop=None if scene.backdrop is None else scene.backdrop.surface,
+            sprites=tuple((surface, rect.copy())
+                          for surface, rect in self._sprite_blits()),
+            panels=tuple((rect.copy(), blits) for rect, blits in panels))
+        self._full_redraw = False
+        self._updated_rects = None
+        self.simu.journal.clear()
+        return snapshot
+
+    def _interpolate(self, alpha):
+        """Return the interpolated rect of the sprites moved by the last
+        physics step.
+
+        Sprites changed since the step (e.g. teleported by a script) are
+        displayed where they are.
+        """
+        if alpha is None:
+            return {}
+        displayed = {}
+        for sprite, (x0, y0, version) in self.simu.last_moves.items():
+            if sprite.version != version:
+                continue
+            rect = sprite.rect
+            if rect.x == x0 and rect.y == y0:
+                continue
+            rect = rect.copy()
+            rect.topleft = (round(x0 + (rect.x - x0) * alpha),
+                            round(y0 + (rect.y - y0) * alpha))
+            displayed[sprite] = rect
+        return displayed
+
+    def _rect_of(self, sprite):
+        """Return the rect where _sprite_ is displayed."""
+        return self._displayed.get(sprite, sprite.rect)
+
+    def _sprite_blits(self):
+        """Return the (surface, rect) pairs of the visible sprites, back to
+        front.
+        """
+        if not self._displayed:
+            return self.simu.sprites.blit_sequence()
+        rect_of = self._rect_of
+        return [(sprite.surface, rect_of(sprite))
+                for sprite in self.simu.sprites if sprite.visible]
+
+    def _merge_rects(self, scene, rects):
+        """Merge overlapping _rects_ clipped to the scene.
+
+        Return None if redrawing everything is cheaper.
+        """
+        scene_rect = scene.rect
+        merged = []
+        for r in rects:
+            r = r.clip(scene_rect)
+            if not r:
+                continue
+            i = r.collidelist(merged)
+            while i != -1:
+                r.union_ip(merged.pop(i))
+                i = r.collidelist(merged)
+            merged.append(r)
+        if len(merged) > self.MAX_DIRTY_RECTS:
+            return None
+        area = sum(r.width * r.height for r in merged)
+        if area > self.MAX_DIRTY_AREA_RATIO * scene_rect.width * scene_rect.height:
+            return None
+        return merged
+
+    def _render_all(self, scene, sprites):
+        self._render_scene(scene)
+        self._render_sprites(scene, sprites)
+        self._shared_variables_renderer.render()
         self._fps_renderer.render()
+        self._profiler_renderer.render()
+        self._drawn.clear()
+        for sprite in sprites:
+            self._record_drawn(sprite)
+        self._full_redraw = False
+
+    def _render_area(self, scene, sprites, area):
+        scene.surface.set_clip(area)
+        try:
+            if scene.backdrop is None:
+                scene.surface.fill(Color.black._c, area)
+            else:
+                scene.surface.blit(scene.backdrop.surface, area, area)
+            overlapping = sprites.iter_overlapping_by_layer(area)
+            if self._displayed:
+                # Interpolated sprites may be displayed far from their rect.
+                overlapping = sprites.sorted_by_layer(
+                    set(overlapping).union(self._displayed))
+            rect_of = self._rect_of
+            scene.surface.blits(
+                [(sprite.surface, rect_of(sprite))
+                 for sprite in overlapping if sprite.visible],
+                doreturn=False)
+            self._shared_variables_renderer.render(area)
+            self._fps_renderer.render(area)
+            self._profiler_renderer.render(area)
+        finally:
+            scene.surface.set_clip(None)
+
+    def _record_drawn(self, sprite):
+        if sprite.visible:
+            self._drawn[sprite] = self._rect_of(sprite).copy()
+        else:
+            self._drawn.pop(sprite, None)
 
     def _render_scene(self, scene):
         if scene.backdrop is None:
@@ -166,43 +609,189 @@ class Renderer:
             scene.surface.blit(scene.backdrop.surface, (0, 0))
 
     def _render_sprites(self, scene, sprites):
-        for sprite in sprites:
-            self._render_sprite(scene, sprite)
+        scene.surface.blits(self._sprite_blits(), doreturn=False)
 
-    def _render_sprite(self, scene, sprite):
-        if not sprite.visible:
-            return
-        scene.surface.blit(sprite.current_image.surface, sprite.rect)
+class Timer:
+    """Handle on a callback scheduled by a TimerService."""
+
+    __slots__ = ("deadline", "callback", "is_cancelled")
+
+    def __init__(self, deadline, callback):
+        self.deadline = deadline
+        self.callback = callback
+        self.is_cancelled = False
+
+    def cancel(self):
+        self.is_cancelled = True
+
+class TimerService:
+    """Call functions once the simulation time passed their deadline.
+
+    Timers are kept in a heap ordered by deadline so that advancing the time
+    only touches the expired ones, however many are pending. Cancelled
+    timers are dropped when they expire.
+    """
+
+    def __init__(self):
+        self._time = 0
+        self._heap = []
+        self._count = 0 # Keep timers with the same deadline in FIFO order.
+
+    @property
+    def time(self):
+        return self._time
+
+    def call_at(self, deadline, callback):
+        """Call _callback_ with no argument once the time is after _deadline_.
+
+        It is called right away if it is already the case. Return a Timer
+        that can be cancelled.
+        """
+        timer = Timer(deadline, callback)
+        if self._time > deadline:
+            callback()
+        else:
+            self._count += 1
+            heapq.heappush(self._heap, (deadline, self._count, timer))
+        return timer
+
+    def call_later(self, delay, callback):
+        """Call _callback_ once _delay_ seconds of simulation time elapsed."""
+        return self.call_at(self._time + delay, callback)
+
+    def advance(self, time):
+        """Set the time to _time_ and call the callbacks of the timers whose
+        deadline passed, in deadline order.
+        """
+        self._time = time
+        heap = self._heap
+        while heap and time > heap[0][0]:
+            timer = heapq.heappop(heap)[2]
+            if not timer.is_cancelled:
+                timer.callback()
 
 class Server:
+    """Serve the requests sent by the scripts.
+
+    Requests of a given script are processed in order: a request is not
+    started before the previous one from the same script has completed.
+
+    Requests posted without waiting for a reply get none. If one of them
+    fails, the following requests of the same script are discarded until the
+    next one waiting for a reply, which receives the error instead.
+
+    All the requests already queued by a script are processed in the same
+    call to process_requests() until one needs to span multiple frames (e.g.
+    moving a sprite or waiting).
+
+    A request spanning multiple frames is not polled: its processor notifies
+    the server when it finishes (e.g. from the completion callback of a
+    sprite move or from a timer). Thus, in-flight requests cost nothing
+    until their state changes.
+    """
 
     def __init__(self, simu):
         self.simu = simu
-        self._running = [] # currently running processors
+        # Currently running processor by script. There is at most one per
+        # script since they are served in order.
+        self._running = {}
+        # Running processors finished since the last call to _run().
+        self._completed = deque()
+        # Requests waiting to be processed by script.
+        self._backlogs = {}
+        # Error of a posted request by script, to be reported at the next
+        # request waiting for a reply.
+        self._deferred_errors = {}
+        # Scripts blocked until they get a reply.
+        self._waiting_scripts = set()
 
     def process_requests(self):
-        self._collect()
-        self._run()
+        profiler = self.simu.profiler
+        with profiler.measure("collect"):
+            self._collect()
+        with profiler.measure("run"):
+            self._run()
 
     def _collect(self):
-        for script in self.simu.scripts:
+        for script, request, wants_reply in self.simu.scripts.iter_requests():
             try:
-                request = script.pipe.request_queue.get(block=False)
-            except EmptyQueue:
-                pass
+                backlog = self._backlogs[script]
+            except KeyError:
+                backlog = self._backlogs[script] = deque()
+            backlog.append((request, wants_reply))
+            if wants_reply:
+                self._waiting_scripts.add(script)
+        for script in list(self._backlogs):
+            if script not in self._running:
+                self._serve(script)
+
+    def _serve(self, script):
+        """Process _script_'s backlog until a request spans multiple frames."""
+        backlog = self._backlogs.get(script)
+        while backlog:
+            request, wants_reply = backlog.popleft()
+            if script in self._deferred_errors:
+                if wants_reply:
+                    self._send_reply(script,
+                                     self._deferred_errors.pop(script))
+                continue
+            processor = RequestProcessors.new(self.simu, script, request,
+                                              wants_reply=wants_reply)
+            processor()
+            if processor.is_finished:
+                self._reply(processor)
             else:
-                processor = RequestProcessors.new(self.simu, script, request)
-                self._running.append(processor)
+                self._running[script] = processor
+                processor.when_finished(self._completed.append)
+                break
+        if not backlog:
+            self._backlogs.pop(script, None)
+
+    @property
+    def waiting_scripts_count(self):
+        """Number of scripts currently waiting for a reply."""
+        return len(self._waiting_scripts)
+
+    @property
+    def pending_count(self):
+        """Number of requests received but not started yet."""
+        return sum(len(backlog) for backlog in self._backlogs.values())
+
+    def forget(self, scripts):
+        """Drop everything kept about the given terminated _scripts_.
+
+        The error of a posted request that a script did not report before
+        terminating is logged.
+        """
+        for script in scripts:
+            self._waiting_scripts.discard(script)
+            self._backlogs.pop(script, None)
+            self._running.pop(script, None)
+            error = self._deferred_errors.pop(script, None)
+            if error is not None:
+                LOGGER.error(f"script {script.name} terminated without "
+                             f"reporting the error of a posted request: "
+                             f"{error!r}")
 
     def _run(self):
-        still_running = []
-        for proc in self._running:
-            if proc.is_finished:
-                proc.script.pipe.reply_queue.put(proc.reply, block=False)
-            else:
-                proc()
-                still_running.append(proc)
-        self._running = still_running
+        completed = self._completed
+        while completed:
+            proc = completed.popleft()
+            if self._running.get(proc.script) is not proc:
+                continue # its script has terminated meanwhile
+            del self._running[proc.script]
+            self._reply(proc)
+            self._serve(proc.script)
+
+    def _reply(self, processor):
+        if processor.wants_reply:
+            self._send_reply(processor.script, processor.reply)
+        elif isinstance(processor.reply, Exception):
+            self._deferred_errors[processor.script] = processor.reply
+
+    def _send_reply(self, script, reply):
+        self._waiting_scripts.discard(script)
+        script.pipe.reply_queue.put(reply, block=False)
 
 class RequestProcessors:
 
@@ -216,19 +805,25 @@ class RequestProcessors:
                 f"no processor available for request: '{request_type_name}'")
 
     @classmethod
-    def new(cls, simu, script, request):
+    def new(cls, simu, script, request, wants_reply=True):
         proc_type = cls.get(request)
-        return proc_type(simu, script, request)
+        return proc_type(simu, script, request, wants_reply=wants_reply)
 
     class RequestProcessor(ABC):
-        """Base class of request processor"""
+        """Base class of request processor
+
+        A processor that is not finished after its first call is not called
+        again: it must finish by itself later on (e.g. from a callback).
+        """
 
-        def __init__(self, simu, script, request):
+        def __init__(self, simu, script, request, wants_reply=True):
             self.simu = simu
             self.script = script
             self.request = request
+            self.wants_reply = wants_reply
             self.__finished = False
             self.__reply = None
+            self.__on_finished = None
 
         def __call__(self):
             try:
@@ -244,9 +839,23 @@ class RequestProcessors:
         def reply(self):
             return self.__reply
 
+        def when_finished(self, callback):
+            """Call _callback_ with this processor once it is finished.
+
+            It is called right away if the processor is already finished.
+            """
+            if self.__finished:
+                callback(self)
+            else:
+                self.__on_finished = callback
+
         def _set_reply(self, reply):
             self.__reply = reply
             self.__finished = True
+            callback = self.__on_finished
+            if callback is not None:
+                self.__on_finished = None
+                callback(self)
 
         def _set_reply_if(self, condition, reply=None):
             if condition:
@@ -308,38 +917,65 @@ class RequestProcessors:
             return rets
 
     class SpriteGetCollisionProcessor(OneShotProcessor):
-        # TODO(Nicolas Despres): Handle mask
         def _run_once(self):
             sprite = self.simu.sprites.by_name(self.request.name)
             collisions = []
-            if not self.simu.scene.rect.contains(sprite.rect):
+            if is_touching_edge(self.simu.scene, sprite):
                 collisions.append(EngineScene.EDGE)
-            for name, other_sprite in self.simu.sprites.items():
-                if sprite.rect.colliderect(other_sprite.rect):
-                    collisions.append(name)
+            for other_sprite in self.simu.sprites.iter_overlapping(sprite.rect):
+                if are_touching(sprite, other_sprite):
+                    collisions.append(other_sprite.name)
             return collisions
 
-    class SpriteMoveProcessor(RequestProcessor):
+    class SpriteTouchingProcessor(OneShotProcessor):
+        """Only test collisions with the requested targets."""
 
-        def __init__(self, *args, **kwargs):
-            super().__init__(*args, **kwargs)
+        def _run_once(self):
             sprite = self.simu.sprites.by_name(self.request.name)
-            self.system = self.simu._physical_engine.move_sprite(sprite, self.request.step)
+            return tuple(self._is_touching(sprite, target)
+                         for target in self.request.targets)
+
+        def _is_touching(self, sprite, target):
+            if target is EngineScene.EDGE:
+                return is_touching_edge(self.simu.scene, sprite)
+            try:
+                other_sprite = self.simu.sprites.by_name(target)
+            except KeyError: # no such sprite, so it cannot be touched
+                return False
+            return are_touching(sprite, other_sprite)
+
+    class MoveProcessor(RequestProcessor):
+        """Base class of processors replying once a sprite move is finished.
+
+        The reply is set by the move's completion callback, so running the
+        processor has nothing left to check.
+        """
+
+        def _start(self, move):
+            self.move = move
+            move.when_finished(self._move_finished)
+
+        def _move_finished(self, move):
+            self._set_reply(None)
 
         def _run(self):
-            self._set_reply_if(self.system.is_finished)
+            pass
 
-    class SpriteMoveByProcessor(RequestProcessor):
+    class SpriteMoveProcessor(MoveProcessor):
 
         def __init__(self, *args, **kwargs):
             super().__init__(*args, **kwargs)
             sprite = self.simu.sprites.by_name(self.request.name)
-            self.system = self.simu._physical_engine.move_sprite_by(sprite, self.request.step_by)
+            self._start(self.simu._physical_engine.move_sprite(sprite, self.request.step))
 
-        def _run(self):
-            self._set_reply_if(self.system.is_finished)
+    class SpriteMoveByProcessor(MoveProcessor):
 
-    class SpriteMoveToProcessor(RequestProcessor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            sprite = self.simu.sprites.by_name(self.request.name)
+            self._start(self.simu._physical_engine.move_sprite_by(sprite, self.request.step_by))
+
+    class SpriteMoveToProcessor(MoveProcessor):
 
         def __init__(self, *args, **kwargs):
             super().__init__(*args, **kwargs)
@@ -348,10 +984,7 @@ class RequestProcessors:
                 pos = self._get_sprite_position(self.request.position)
             else:
                 pos = self.request.position
-            self.system = self.simu._physical_engine.move_sprite_to(sprite, pos, self.request.duration)
-
-        def _run(self):
-            self._set_reply_if(self.system.is_finished)
+            self._start(self.simu._physical_engine.move_sprite_to(sprite, pos, self.request.duration))
 
         def _get_sprite_position(self, name):
             try:
@@ -368,8 +1001,15 @@ class RequestProcessors:
             self.start_time = self.simu.time
 
         def _run(self):
-            waiting_time = self.simu.time - self.start_time
-            self._set_reply_if(waiting_time > self.request.delay)
+            self.simu.timers.call_at(self.start_time + self.request.delay,
+                                     self._expired)
+
+        def _expired(self):
+            self._set_reply(None)
+
+    class SyncProcessor(OneShotProcessor):
+        def _run_once(self):
+            pass
 
     class StopProgramProcessor(OneShotProcessor):
         def _run_once(self):
@@ -380,6 +1020,19 @@ class RequestProcessors:
             f = getattr(self.simu.sprites, self.request.op)
             return f(*self.request.args, **self.request.kwargs)
 
+def is_touching_edge(scene, sprite):
+    return not scene.rect.contains(sprite.rect)
+
+def are_touching(sprite, other_sprite):
+    """Pixel-perfect collision test."""
+    r = sprite.rect
+    other_r = other_sprite.rect
+    # Cheap test first.
+    if not r.colliderect(other_r):
+        return False
+    offset = (other_r.left - r.left, other_r.top - r.top)
+    return sprite.mask.overlap(other_sprite.mask, offset) is not None
+
 class EventManager:
 
     def __init__(self, simu):
@@ -392,6 +1045,10 @@ class EventManager:
         #LOGGER.debug(f"schedule {len(handlers)} handlers for event: {event} - hash_value={event._hash_value!r}")
         self._pending.extend(handlers)
 
+    @property
+    def has_pending(self):
+        return bool(self._pending)
+
     def trigger(self):
         # if self._pending:
         #     print(f"trigger")
@@ -433,15 +1090,172 @@ class FPS:
     def fps(self):
         return self._fps
 
+class GovernorStats(NamedTuple):
+    """Snapshot of a FrameRateGovernor's statistics."""
+
+    fps: float # current frame rate
+    load: float # smoothed ratio of the frame period spent working
+    frames: int
+    lowered_count: int # number of times the frame rate was lowered
+    raised_count: int # number of times the frame rate was raised
+    capped_frames: int # frames whose catch-up loop was cut short
+    dropped_steps: int # physics steps skipped by these frames
+
+class FrameRateGovernor:
+    """Adapt the frame rate to the load of the engine.
+
+    The load is the part of the frame period spent simulating and rendering,
+    smoothed over the last frames. The frame rate is lowered when the load
+    is high or when requests pile up, and raised back toward _target_fps_
+    when there is slack. The number of physics steps run in a frame is
+    capped to _max_catch_up_steps_ more than a regular frame needs, so that
+    a slow simulation does not fall further and further behind.
+
+    Parameters:
+      adaptive: when False, the frame rate stays at _target_fps_ and only
+                the catch-up steps are capped.
+    """
+
+    HIGH_LOAD = 0.9
+    LOW_LOAD = 0.5
+    # Pending requests beyond which scripts are considered outpacing the
+    # engine.
+    MAX_PENDING_REQUESTS = 64
+    LOWER_FACTOR = 0.8
+    RAISE_FACTOR = 1.1
+    # Weight of the last frame in the smoothed load.
+    SMOOTHING = 0.1
+    # Number of frames to wait after an adjustment before the next one.
+    COOLDOWN = 10
+
+    def __init__(self, target_fps, min_fps=None, max_catch_up_steps=5,
+                 adaptive=True):
+        self._target_fps = target_fps
+        self._min_fps = max(1, target_fps // 4) if min_fps is None else min_fps
+        self._max_catch_up_steps = max_catch_up_steps
+        self._adaptive = adaptive
+        self._fps = target_fps
+        self._load = 0
+        self._cooldown = 0
+        self._frames = 0
+        self._lowered_count = 0
+        self._raised_count = 0
+        self._capped_frames = 0
+        self._dropped_steps = 0
+
+    @property
+    def fps(self):
+        return self._fps
+
+    @property
+    def frame_time(self):
+        return 1 / self._fps
+
+    def max_steps(self, delta_time):
+        """Return the maximum number of physics steps of _delta_time_ to run
+        in a frame.
+        """
+        return math.ceil(self.frame_time / delta_time) \
+            + self._max_catch_up_steps
+
+    def steps_dropped(self, count):
+        """Record that the catch-up loop of the frame skipped _count_
+        steps.
+        """
+        self._capped_frames += 1
+        self._dropped_steps += count
+
+    def frame_done(self, work_time, pending_requests=0):
+        """Adjust the frame rate after a frame that spent _work_time_
+        seconds simulating and rendering.
+        """
+        self._frames += 1
+        self._load += (work_time * self._fps - self._load) * self.SMOOTHING
+        if not self._adaptive:
+            return
+        if self._cooldown > 0:
+            self._cooldown -= 1
+            return
+        if self._load > self.HIGH_LOAD \
+           or pending_requests > self.MAX_PENDING_REQUESTS:
+            fps = max(self._min_fps, self._fps * self.LOWER_FACTOR)
+            if fps < self._fps:
+                self._fps = fps
+                self._lowered_count += 1
+                self._cooldown = self.COOLDOWN
+        elif self._load < self.LOW_LOAD and self._fps < self._target_fps:
+            self._fps = min(self._target_fps, self._fps * self.RAISE_FACTOR)
+            self._raised_count += 1
+            self._cooldown = self.COOLDOWN
+
+    @property
+    def stats(self):
+        return GovernorStats(self._fps, self._load, self._frames,
+                             self._lowered_count, self._raised_count,
+                             self._capped_frames, self._dropped_steps)
+
+class FrameJournal:
+    """Record what changed on stage since the last rendered frame.
+
+    It observes the sprites list and the scene. Changes of the shared
+    variables are read from their own flag, which the renderer clears
+    before reading them, so that a change made meanwhile is not lost.
+    """
+
+    def __init__(self, shared_variables=None):
+        self.changed_sprites = set() # moved, shown/hidden or re-layered
+        self.backdrop_changed = False
+        self.shared_variables = shared_variables
+
+    def sprite_changed(self, sprite):
+        self.changed_sprites.add(sprite)
+
+    def backdrop_switched(self):
+        self.backdrop_changed = True
+
+    @property
+    def shared_variables_updated(self):
+        return self.shared_variables is not None \
+            and self.shared_variables.has_changed
+
+    @property
+    def is_empty(self):
+        return not self.changed_sprites \
+            and not self.backdrop_changed \
+            and not self.shared_variables_updated
+
+    def clear(self):
+        """Forget the sprite and scene changes."""
+        self.changed_sprites.clear()
+        self.backdrop_changed = False
+
 class SpritesList(Sequence):
     """Holds the list of all sprites.
 
-    Allow sequential access by z-order and access by sprite name
+    Allow sequential access by z-order and access by sprite name.
+    Also index sprites' position to quickly find those in a given area.
     """
 
-    def __init__(self):
+    def __init__(self, cell_size=UniformGrid.DEFAULT_CELL_SIZE):
         self._sprites = []
         self._names = {}
+        self._grid = UniformGrid(cell_size=cell_size)
+        # Sprites changed since the grid was last updated.
+        self._outdated = set()
+        # Sprites changed since their state was last published.
+        self._unpublished = set()
+        # Layer index by sprite. Computed on demand.
+        self._layers = None
+        # Sequence of (surface, rect) of the visible sprites, back to front,
+        # as expected by Surface.blits(). Computed on demand. Rects are
+        # updated in place by moves, so only visibility, costume, rotation
+        # and layer changes outdate it.
+        self._blits = None
+        # Entry of each sprite in _blits.
+        self._blit_entries = {}
+        # Notified of every change of a sprite, including its layer, by
+        # calling its sprite_changed() method.
+        self.observer = None
 
     def __getitem__(self, i):
         return self._sprites[i]
@@ -459,6 +1273,92 @@ class SpritesList(Sequence):
         assert " " not in sprite.name
         self._sprites.append(sprite)
         self._names[sprite.name] = sprite
+        self._grid.insert(sprite, sprite.rect)
+        self._unpublished.add(sprite)
+        sprite.observer = self
+        self._layer_changed(sprite)
+
+    def sprite_changed(self, sprite):
+        # The grid is updated lazily since sprites are moved far more often
+        # than queried.
+        self._outdated.add(sprite)
+        self._unpublished.add(sprite)
+        if self._blits is not None and not self._is_blit_entry_valid(sprite):
+            self._blits = None
+        self._notify(sprite)
+
+    def _is_blit_entry_valid(self, sprite):
+        entry = self._blit_entries.get(sprite)
+        if not sprite.visible:
+            return entry is None
+        return entry is not None \
+            and entry[0] is sprite.surface \
+            and entry[1] is sprite.rect
+
+    def blit_sequence(self):
+        """Return the (surface, rect) pairs of the visible sprites, back to
+        front, ready to be passed to Surface.blits().
+
+        The returned list is shared and must not be modified.
+        """
+        if self._blits is None:
+            self._blit_entries = {
+                sprite: (sprite.surface, sprite.rect)
+                for sprite in self._sprites if sprite.visible}
+            # Dictionaries preserve insertion order, thus the layers order.
+            self._blits = list(self._blit_entries.values())
+        return self._blits
+
+    def _notify(self, sprite):
+        if self.observer is not None:
+            self.observer.sprite_changed(sprite)
+
+    def publish_states(self):
+        """Snapshot the state of the sprites changed since the last call.
+
+        Scripts then read it without sending any request (see
+        EngineSprite.state).
+        """
+        for sprite in self._unpublished:
+            sprite.get_state()
+        self._unpublished.clear()
+
+    def _update_grid(self):
+        for sprite in self._outdated:
+            self._grid.update(sprite, sprite.rect)
+        self._outdated.clear()
+
+    def _get_overlapping(self, rect):
+        self._update_grid()
+        return [sprite for sprite in self._grid.query_rect(rect)
+                if sprite.rect.colliderect(rect)]
+
+    def iter_overlapping(self, rect):
+        """Iterate over the sprites whose rect overlaps _rect_, by name."""
+        return iter(sorted(self._get_overlapping(rect),
+                           key=attrgetter("name")))
+
+    def iter_overlapping_by_layer(self, rect):
+        """Iterate over the sprites whose rect overlaps _rect_, back to
+        front.
+        """
+        return iter(self.sorted_by_layer(self._get_overlapping(rect)))
+
+    def sorted_by_layer(self, sprites):
+        """Return the given _sprites_ sorted back to front."""
+        if self._layers is None:
+            self._layers = {sprite: i for i, sprite in enumerate(self._sprites)}
+        return sorted(sprites, key=self._layers.__getitem__)
+
+    def find_top_at(self, position):
+        """Return the top-most sprite at _position_ or None."""
+        self._update_grid()
+        candidates = self._grid.query_point(position)
+        # Only order the few sprites near _position_, front to back.
+        for sprite in reversed(self.sorted_by_layer(candidates)):
+            if sprite.rect.collidepoint(position):
+                return sprite
+        return None
 
     def by_name(self, name):
         return self._names[name]
@@ -472,11 +1372,20 @@ class SpritesList(Sequence):
     def pop_by_name(self, sprite_name):
         return self._sprites.pop(self.index_by_name(sprite_name))
 
+    def _layer_changed(self, sprite):
+        self._layers = None
+        self._blits = None
+        self._notify(sprite)
+
     def go_to_front_layer(self, sprite_name):
-        self._sprites.append(self.pop_by_name(sprite_name))
+        sprite = self.pop_by_name(sprite_name)
+        self._sprites.append(sprite)
+        self._layer_changed(sprite)
 
     def go_to_back_layer(self, sprite_name):
-        self._sprites.insert(0, self.pop_by_name(sprite_name))
+        sprite = self.pop_by_name(sprite_name)
+        self._sprites.insert(0, sprite)
+        self._layer_changed(sprite)
 
     def change_layer_by(self, sprite_name, shift):
         i = self.index_by_name(sprite_name)
@@ -485,14 +1394,19 @@ class SpritesList(Sequence):
         if i < 0:
             i = 0
         self._sprites.insert(i, sprite)
+        self._layer_changed(sprite)
 
 class AbstractSimulation(ABC):
 
+    # Whether rendering interpolates sprites' position between physics steps.
+    interpolate = False
+
     def __init__(self):
         self.__is_running = False
         self.__real_simu_duration = 0
         self.__real_render_duration = 0
         self.fps = FPS()
+        self.profiler = NullProfiler()
 
     @property
     @abstractmethod
@@ -545,7 +1459,8 @@ class AbstractSimulation(ABC):
         pass
 
     def flip(self):
-        self._on_flip()
+        with self.profiler.measure("flip"):
+            self._on_flip()
 
     @abstractmethod
     def _on_flip(self):
@@ -554,6 +1469,14 @@ class AbstractSimulation(ABC):
     def process_inputs(self):
         self._on_process_inputs()
 
+    def wait_for_inputs(self, timeout):
+        """Sleep until new inputs are available or _timeout_ expires."""
+        self._on_wait_for_inputs(timeout)
+
+    @abstractmethod
+    def _on_wait_for_inputs(self, timeout):
+        pass
+
     def simulate(self):
         t0 = time()
         self._on_simulate()
@@ -570,9 +1493,27 @@ class AbstractSimulation(ABC):
     def _on_simulate(self):
         pass
 
-    def render(self):
+    @property
+    def needs_render(self):
+        """Whether something changed since the last rendered frame."""
+        return True
+
+    @property
+    def pending_requests_count(self):
+        """Number of requests received from the scripts but not started
+        yet.
+        """
+        return 0
+
+    def render(self, alpha=None):
+        """Render the current frame.
+
+        _alpha_ is the fraction of delta_time elapsed since the last
+        simulation step. It is ignored unless the simulation interpolates.
+        """
         t0 = time()
-        self._on_render()
+        with self.profiler.measure("render"):
+            self._on_render(alpha if self.interpolate else None)
         t1 = time()
         self.fps.tick()
         self.__real_render_duration = t1 - t0
@@ -582,21 +1523,38 @@ class AbstractSimulation(ABC):
         return self.__real_render_duration
 
     @abstractmethod
-    def _on_render(self):
+    def _on_render(self, alpha):
         pass
 
 class Simulation(AbstractSimulation):
 
-    def __init__(self, project, show_fps=False):
+    def __init__(self, project, show_fps=False, headless=False,
+                 render_thread=False, interpolate=False,
+                 delta_time=physics.PhysicalEngine.DEFAULT_DELTA_TIME,
+                 vectorized_physics=False, profile=False):
         super().__init__()
         self.project = project
+        if profile:
+            self.profiler = FrameProfiler()
+        self.headless = headless
+        self.interpolate = interpolate
+        # Whether frames are composed by a separate thread so that rendering
+        # does not delay the requests' replies.
+        self.render_thread = render_thread
+        self._render_thread = None
         self.scene = EngineScene()
         self.mouse = EngineMouse()
+        self.shared_variables = SharedVariableSet()
+        self.journal = FrameJournal(self.shared_variables)
         self.sprites = SpritesList()
+        self.sprites.observer = self.journal
+        self.scene.observer = self.journal
         self.event_manager = EventManager(self)
         self.scripts = ScriptSet()
-        self.shared_variables = SharedVariableSet()
-        self._physical_engine = physics.PhysicalEngine()
+        self._physical_engine = physics.PhysicalEngine(
+            delta_time=delta_time, vectorized=vectorized_physics)
+        # Timed events, on the physics time.
+        self.timers = TimerService()
         self._renderer = Renderer(self, show_fps=show_fps)
 
     @property
@@ -607,8 +1565,17 @@ class Simulation(AbstractSimulation):
     def time(self):
         return self._physical_engine.time
 
+    @property
+    def last_moves(self):
+        return self._physical_engine.last_moves
+
     def _on_boot(self):
         self._show_banner()
+        if self.headless:
+            # Must be set before pygame.init() so that SDL renders into an
+            # offscreen surface instead of opening a window.
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+            os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
         pygame.init()
         pygame.display.set_caption(self.project.name)
         self.scene.surface = pygame.display.set_mode(self.scene.size)
@@ -622,16 +1589,49 @@ class Simulation(AbstractSimulation):
         self.mouse.buttons = pygame.mouse.get_pressed()
         set_mouse(self.mouse, self.scene.coordsys)
         self._server = Server(self)
+        if self.render_thread:
+            self._render_thread = RenderThread(self.scene.surface)
+            self._render_thread.start()
         self.event_manager.schedule(event.ProgramStart())
 
     def _on_shutdown(self):
         self.scripts.join()
 
     def _on_halt(self):
-        pygame.quit()
+        # Exception making the simulation halt, if any.
+        halt_error = sys.exc_info()[1]
+        try:
+            if self._render_thread is not None:
+                self._render_thread.stop()
+                if self._render_thread.error is not None \
+                   and halt_error is not None:
+                    # Do not hide the error we are halting because of.
+                    LOGGER.error("render thread failed: "
+                                 f"{self._render_thread.error!r}")
+                else:
+                    # Present the last composed frame.
+                    self._on_flip()
+        finally:
+            pygame.quit()
 
     def _on_flip(self):
-        pygame.display.flip()
+        if self._render_thread is not None:
+            # Present the last frame composed by the render thread, if any.
+            # It is done here since SDL video calls must stay on the main
+            # thread.
+            frame = self._render_thread.take_frame()
+            if frame is not None:
+                self.scene.surface.blit(frame, (0, 0))
+                if not self.headless:
+                    pygame.display.flip()
+            return
+        if self.headless:
+            return
+        rects = self._renderer.updated_rects
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
 
     def _show_banner(self):
         def printer(msg):
@@ -648,6 +1648,7 @@ class Simulation(AbstractSimulation):
         default_font_name = pygame.font.get_default_font()
         # print(f"default font: {default_font_name}")
         self.default_font = pygame.font.Font(default_font_name, 16)
+        self.text_cache = TextCache(self.default_font)
         LOGGER.info("Loading...")
         self.scene.surface.fill(self.LOAD_BACK_COLOR._c)
         self.flip()
@@ -658,16 +1659,59 @@ class Simulation(AbstractSimulation):
         Configurer(self).configure()
 
     def _on_process_inputs(self):
-        self.event_manager.trigger()
-        self._process_user_input()
+        profiler = self.profiler
+        with profiler.measure("trigger"):
+            self.event_manager.trigger()
+        with profiler.measure("user_input"):
+            self._process_user_input()
+        with profiler.measure("rip"):
+            done_scripts = self.scripts.rip_done_scripts()
+        # The terminated scripts sent all their requests before they were
+        # ripped, so we serve them before to forget these scripts.
         self._server.process_requests()
-        self.scripts.rip_done_scripts()
+        self._server.forget(done_scripts)
+
+    def _on_wait_for_inputs(self, timeout):
+        self.scripts.wait(timeout)
+
+    @property
+    def pending_requests_count(self):
+        return self._server.pending_count
+
+    @property
+    def is_idle(self):
+        """Whether every running script is blocked waiting for a reply.
+
+        When it is the case, nothing can happen until the simulated time
+        advances.
+        """
+        return not self.event_manager.has_pending \
+            and self._server.waiting_scripts_count >= len(self.scripts)
 
     def _on_simulate(self):
-        self._physical_engine.step()
+        with self.profiler.measure("physics"):
+            self._physical_engine.step()
+            self.timers.advance(self.time)
+        # Before the requests waiting for this step are replied, so that the
+        # woken up scripts find an up-to-date state.
+        self.sprites.publish_states()
+
+    @property
+    def needs_render(self):
+        # A frame composed by the render thread may still be waiting to be
+        # presented.
+        return self._scene_changed or (self._render_thread is not None
+                                       and self._render_thread.has_frame)
 
-    def _on_render(self):
-        self._renderer.render()
+    @property
+    def _scene_changed(self):
+        return not self.journal.is_empty or self._renderer.is_outdated
+
+    def _on_render(self, alpha):
+        if self._render_thread is None:
+            self._renderer.render(alpha)
+        elif self._scene_changed:
+            self._render_thread.publish(self._renderer.snapshot(alpha))
 
     def _process_user_input(self):
         # print("start input processing")
@@ -699,25 +1743,51 @@ class Simulation(AbstractSimulation):
         self.mouse.process_events(events)
 
     def _get_clicked_sprite(self, position):
-        for sprite in reversed(self.sprites):
-            if sprite.rect.collidepoint(position):
-                return sprite
+        return self.sprites.find_top_at(position)
 
 class Engine:
     """Run a simulation.
 
     Parameters:
       target_fps: the number of frames per second the engine will try to run at
+      throttle: whether to pace the simulation to the wall-clock. When False,
+                the simulated time advances as soon as every script is waiting
+                for the engine, thus as fast as the CPU allows.
+      time_limit: stop the simulation once this amount of simulated time (in
+                  seconds) has elapsed.
+      adaptive_fps: whether to lower the frame rate below _target_fps_ when
+                    the engine is overloaded (see FrameRateGovernor).
+      max_catch_up_steps: maximum number of physics steps run per frame, in
+                          addition to those of a regular frame, to catch up
+                          with the wall-clock.
+      script_lag_timeout: maximum wall-clock time (in seconds) an unthrottled
+                          engine waits for scripts busy running user code
+                          before to advance the simulated time anyway. When
+                          None, it waits as long as needed so that the
+                          simulated results do not depend on the speed of
+                          the machine, but a script that never sends any
+                          request then blocks the simulation.
     """
 
-    def __init__(self, simu, target_fps=30):
+    def __init__(self, simu, target_fps=30, throttle=True, time_limit=None,
+                 adaptive_fps=True, max_catch_up_steps=5,
+                 script_lag_timeout=None):
         if not isinstance(target_fps, int):
             raise TypeError("target_fps must be int, not {}"
                             .format(type(target_fps).__name__))
+        if time_limit is not None and not isinstance(time_limit, (int, float)):
+            raise TypeError("time_limit must be int or float, not {}"
+                            .format(type(time_limit).__name__))
         self.simu = simu
-        if self.simu.delta_time > 1 / target_fps:
+        if self.simu.delta_time > 1 / target_fps and not self.simu.interpolate:
             LOGGER.warning(f"simulation delta-time {self.simu.delta_time}ms is larger than target FPS={target_fps}: simulation will never catch up")
         self._target_fps = target_fps # The pace will try to keep
+        self._throttle = throttle
+        self._time_limit = time_limit
+        self._script_lag_timeout = script_lag_timeout
+        self._governor = FrameRateGovernor(
+            target_fps, max_catch_up_steps=max_catch_up_steps,
+            adaptive=adaptive_fps)
         # Initialized in run() after the simulation boot
         self._clock = None
 
@@ -732,41 +1802,123 @@ class Engine:
             # elapsed since the simulation boot
             self._running_time = 0
             self.epoch = time()
-            accumulated_time = 0
-            target_frame_time = 1 / self.target_fps
-            frame_time = 0
-            while self.simu.is_running:
-                tick0 = time()
-                accumulated_time += frame_time
-                simu_count = 0
-                while accumulated_time >= self.simu.delta_time:
-                    self.simu.process_inputs()
-                    self.simu.simulate()
-                    # Give a chance to the OS to schedule the user thread.
-                    sleep(1e-6)
-                    accumulated_time -= self.simu.delta_time
-                    simu_count += 1
-                self.simu.render()
-                self.simu.flip()
-                tick = time()
-                # Process inputs with the remaining time until we reach the
-                # target_frame_time
-                while tick - tick0 <= target_frame_time:
-                    self.simu.process_inputs()
-                    # Give a chance to the OS to schedule the user thread.
-                    sleep(1e-6)
-                    tick = time()
-                frame_time = tick - tick0
-                # LOGGER.debug(f"FPS={self.fps:.2f} ; {simu_count=} ; {frame_time=:.6f}s ; {accumulated_time=:.6f}s ; simu={self.simu.time:.6f}s ; running={self._running_time:.6f}s ; simu_duration={self.simu.real_simu_duration:.6f}s ; render_duration={self.simu.real_render_duration:.6f}s ; real={self.real_time:.6f}")
-                self._running_time += frame_time
+            if self._throttle:
+                self._run_paced()
+            else:
+                self._run_unthrottled()
             self.simu.shutdown()
         finally:
             self.simu.halt()
 
+    def _run_paced(self):
+        governor = self._governor
+        delta_time = self.simu.delta_time
+        accumulated_time = 0
+        frame_time = 0
+        while self.simu.is_running:
+            tick0 = time()
+            accumulated_time += frame_time
+            simu_count = 0
+            work_time = 0
+            while accumulated_time >= delta_time:
+                if simu_count == governor.max_steps(delta_time):
+                    # Give up catching up rather than spending even more time
+                    # simulating in the next frames.
+                    dropped = int(accumulated_time // delta_time)
+                    accumulated_time -= dropped * delta_time
+                    governor.steps_dropped(dropped)
+                    break
+                self.simu.process_inputs()
+                self._simulate()
+                work_time += self.simu.real_simu_duration
+                accumulated_time -= delta_time
+                simu_count += 1
+            if self._render(alpha=accumulated_time / delta_time):
+                work_time += self.simu.real_render_duration
+            # Serve requests as they arrive until the next frame deadline and
+            # sleep the rest of the time.
+            deadline = tick0 + governor.frame_time
+            tick = time()
+            while tick < deadline:
+                self.simu.process_inputs()
+                self.simu.wait_for_inputs(timeout=deadline - tick)
+                tick = time()
+            frame_time = tick - tick0
+            governor.frame_done(work_time, self.simu.pending_requests_count)
+            self.simu.profiler.end_frame()
+            # LOGGER.debug(f"FPS={self.fps:.2f} ; {simu_count=} ; {frame_time=:.6f}s ; {accumulated_time=:.6f}s ; simu={self.simu.time:.6f}s ; running={self._running_time:.6f}s ; simu_duration={self.simu.real_simu_duration:.6f}s ; render_duration={self.simu.real_render_duration:.6f}s ; real={self.real_time:.6f}")
+            self._running_time += frame_time
+
+    def _run_unthrottled(self):
+        # The simulated time is decoupled from the wall-clock: we step the
+        # physics as soon as all scripts are blocked on a request and render
+        # once every simulated frame.
+        target_frame_time = 1 / self.target_fps
+        accumulated_time = 0
+        while self.simu.is_running:
+            self._wait_for_scripts()
+            self._simulate()
+            accumulated_time += self.simu.delta_time
+            if accumulated_time >= target_frame_time:
+                self._render()
+                accumulated_time -= target_frame_time
+                self.simu.profiler.end_frame()
+            self._running_time += self.simu.delta_time
+
+    def _wait_for_scripts(self):
+        """Serve requests until every script waits for the simulated time."""
+        timeout = self._script_lag_timeout
+        deadline = None if timeout is None else time() + timeout
+        self.simu.process_inputs()
+        while self.simu.is_running and not self.simu.is_idle:
+            # Events scheduled by the last requests are triggered right away.
+            if not self.simu.event_manager.has_pending:
+                if deadline is None:
+                    self.simu.wait_for_inputs(timeout=None)
+                else:
+                    tick = time()
+                    if tick >= deadline:
+                        break
+                    self.simu.wait_for_inputs(timeout=deadline - tick)
+            self.simu.process_inputs()
+
+    def _render(self, alpha=None):
+        """Render and present a frame unless nothing changed.
+
+        Return whether a frame was rendered.
+        """
+        if not self.simu.needs_render:
+            return False
+        self.simu.render(alpha)
+        self.simu.flip()
+        return True
+
+    def _simulate(self):
+        self.simu.simulate()
+        if self._time_limit is not None and self.simu.time >= self._time_limit:
+            self.simu.stop(reason=f"time limit of {self._time_limit}s reached")
+
     @property
     def target_fps(self):
         return self._target_fps
 
+    @property
+    def throttle(self):
+        return self._throttle
+
+    @property
+    def stats(self):
+        """Frame rate statistics of the paced engine (see GovernorStats)."""
+        return self._governor.stats
+
+    @property
+    def time_limit(self):
+        return self._time_limit
+
+    @property
+    def script_lag_timeout(self):
+        return self._script_lag_timeout
+
     @property
     def running_time(self):
         return self._running_time
@@ -289,6 +289,9 @@ class CoordSys(_BaseSystem, metaclass=_MetaSystem):
 class center(CoordSys):
     """Converter from 'center' coordinate system to pygame top-left coordinate system."""
 
+    # Attributes of a sprite's rect set to its discrete abscissa and ordinate.
+    RECT_ANCHOR = ("centerx", "centery")
+
     def __init__(self, origin):
         self.origin = origin
 
@@ -330,6 +333,9 @@ class center(CoordSys):
 
 class topleft(CoordSys):
 
+    # Attributes of a sprite's rect set to its discrete abscissa and ordinate.
+    RECT_ANCHOR = ("x", "y")
+
     def __init__(self, origin):
         pass
 
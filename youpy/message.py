@@ -44,6 +44,11 @@ class SpriteOp:
 class SpriteGetCollision:
     name: str
 
+@dataclass
+class SpriteTouching:
+    name: str
+    targets: Tuple[Any]
+
 @dataclass
 class SpriteBatchOp:
     name: str
@@ -69,6 +74,10 @@ class SpriteMoveTo:
 class Wait:
     delay: float
 
+@dataclass
+class Sync:
+    """Wait for all previously posted requests to be processed."""
+
 @dataclass
 class StopProgram:
     reason: str
@@ -3,48 +3,282 @@
 """
 
 
+try:
+    import numpy
+except ImportError: # NumPy is optional
+    numpy = None
+
 from youpy import math
 from youpy import logging
 LOGGER = logging.getLogger(__name__)
 
 
-class SpriteMoveSystem:
+class Move:
+    """Base class of the handles on sprite moves."""
+
+    __slots__ = ("_on_finished",)
+
+    def __init__(self):
+        self._on_finished = None
 
-    __slots__ = ("_sprite", "_velocity", "_destination", "_step_count")
+    def when_finished(self, callback):
+        """Call _callback_ with this move once it is finished.
+
+        It is called right away if the move is already finished. Only the
+        last registered callback is kept.
+        """
+        if self.is_finished:
+            callback(self)
+        else:
+            self._on_finished = callback
 
-    def __init__(self, sprite, velocity, destination, step_count):
+    def _finished(self):
+        callback = self._on_finished
+        if callback is not None:
+            self._on_finished = None
+            callback(self)
+
+class SpriteMoveSystem(Move):
+    """Move a sprite along a straight line in a given number of steps.
+
+    The state is kept in plain float fields and the sprite is updated in
+    place so that a step allocates no object but short-lived numbers. The
+    goal is to reduce allocations, not to remove them all.
+    """
+
+    __slots__ = ("_sprite", "_velocity_x", "_velocity_y", "_destination_x",
+                 "_destination_y", "_step_count", "_from_x", "_from_y",
+                 "_version")
+
+    def __init__(self, sprite, velocity_x, velocity_y,
+                 destination_x, destination_y, step_count):
+        super().__init__()
         self._sprite = sprite
-        self._velocity = velocity
-        self._destination = destination
+        self._velocity_x = velocity_x
+        self._velocity_y = velocity_y
+        self._destination_x = destination_x
+        self._destination_y = destination_y
         self._step_count = step_count
+        # Top-left corner of the sprite before the last step and its version
+        # after it.
+        self._from_x = None
+        self._from_y = None
+        self._version = None
 
     def _step(self):
-        self._sprite.move_by_velocity(self._velocity)
+        """Advance the move by one step and return whether it is finished."""
+        sprite = self._sprite
+        rect = sprite.rect
+        self._from_x = rect.x
+        self._from_y = rect.y
         self._step_count -= 1
         if self._step_count == 0:
             # Move the sprite to the final position in all cases so that
             # if MOVE_DURATION is not a multiple of delta_time, we still end-up
             # at the right position.
-            self._sprite.go_to_position(self._destination)
+            self._version = sprite.glide_to(self._destination_x,
+                                            self._destination_y)
+            return True
+        p = sprite.position
+        self._version = sprite.glide_to(p.x + self._velocity_x,
+                                        p.y + self._velocity_y)
+        return False
 
     @property
     def is_finished(self):
         return self._step_count <= 0
 
+class SpriteMove(Move):
+    """Handle on a move run by a MotionStore."""
+
+    __slots__ = ("sprite", "is_finished", "_version", "_from_x", "_from_y")
+
+    def __init__(self, sprite):
+        super().__init__()
+        self.sprite = sprite
+        self.is_finished = False
+        # Version of the sprite after the store last moved it.
+        self._version = sprite.version
+        # Top-left corner of the sprite before the last step.
+        self._from_x = None
+        self._from_y = None
+
+class MotionStore:
+    """Sprite moves in progress stored as struct-of-arrays.
+
+    Positions, velocities, destinations and remaining step counts of all
+    moves are kept in contiguous NumPy arrays and advanced at once. Only
+    writing the positions back to the sprites is done sprite by sprite.
+
+    The arrays, including the scratch mask of the finished moves, are
+    pre-allocated. Thus, unless some moves finish, a step only allocates
+    short-lived numbers and array views, and its peak memory use barely
+    grows with the number of moves.
+    """
+
+    INITIAL_CAPACITY = 64
+
+    def __init__(self):
+        if numpy is None:
+            raise RuntimeError("MotionStore requires NumPy")
+        self._moves = []
+        # Moves finished by the last step.
+        self._finished_moves = []
+        self._allocate(self.INITIAL_CAPACITY)
+
+    def _allocate(self, capacity):
+        count = len(self._moves)
+        positions = numpy.empty((capacity, 2))
+        velocities = numpy.empty((capacity, 2))
+        destinations = numpy.empty((capacity, 2))
+        steps = numpy.empty(capacity, dtype=numpy.int64)
+        if count > 0:
+            positions[:count] = self._positions[:count]
+            velocities[:count] = self._velocities[:count]
+            destinations[:count] = self._destinations[:count]
+            steps[:count] = self._steps[:count]
+        self._positions = positions
+        self._velocities = velocities
+        self._destinations = destinations
+        self._steps = steps
+        self._finished = numpy.empty(capacity, dtype=bool)
+
+    def __len__(self):
+        return len(self._moves)
+
+    @property
+    def last_moves(self):
+        """Map the sprites moved by the last step to their top-left corner
+        before it and their version after it (see PhysicalEngine.last_moves).
+        """
+        last_moves = {}
+        for moves in (self._moves, self._finished_moves):
+            for move in moves:
+                if move._from_x is not None:
+                    _merge_move(last_moves, move.sprite, move._from_x,
+                                move._from_y, move._version)
+        return last_moves
+
+    def add(self, sprite, velocity_x, velocity_y,
+            destination_x, destination_y, step_count):
+        move = SpriteMove(sprite)
+        if step_count <= 0:
+            move.is_finished = True
+            return move
+        i = len(self._moves)
+        if i == len(self._steps):
+            self._allocate(2 * i)
+        p = sprite.position
+        self._positions[i] = (p.x, p.y)
+        self._velocities[i] = (velocity_x, velocity_y)
+        self._destinations[i] = (destination_x, destination_y)
+        self._steps[i] = step_count
+        self._moves.append(move)
+        return move
+
+    def step(self):
+        """Advance all moves by one step."""
+        self._finished_moves.clear()
+        count = len(self._moves)
+        if count == 0:
+            return
+        positions = self._positions[:count]
+        velocities = self._velocities[:count]
+        destinations = self._destinations[:count]
+        steps = self._steps[:count]
+        finished = self._finished[:count]
+        positions += velocities
+        steps -= 1
+        numpy.equal(steps, 0, out=finished)
+        any_finished = finished.any()
+        if any_finished:
+            numpy.copyto(positions, destinations, where=finished[:, None])
+        # Read the coordinates one by one rather than with tolist(), which
+        # would build a list per move.
+        position = positions.item
+        for i, move in enumerate(self._moves):
+            sprite = move.sprite
+            rect = sprite.rect
+            move._from_x = rect.x
+            move._from_y = rect.y
+            if sprite.version != move._version:
+                # Moved by someone else (e.g. another move of the same
+                # sprite) since our last step: resume from where it is.
+                if finished[i]:
+                    x = destinations.item(i, 0)
+                    y = destinations.item(i, 1)
+                else:
+                    p = sprite.position
+                    x = p.x + velocities.item(i, 0)
+                    y = p.y + velocities.item(i, 1)
+                    positions[i, 0] = x
+                    positions[i, 1] = y
+            else:
+                x = position(i, 0)
+                y = position(i, 1)
+            move._version = sprite.glide_to(x, y)
+        if any_finished:
+            self._remove_finished(finished)
+
+    def _remove_finished(self, finished):
+        running = ~finished
+        count = int(running.sum())
+        finished_moves = self._finished_moves
+        for move, is_finished in zip(self._moves, finished.tolist()):
+            if is_finished:
+                move.is_finished = True
+                finished_moves.append(move)
+        self._moves = [move for move in self._moves if not move.is_finished]
+        n = len(finished)
+        for array in (self._positions, self._velocities, self._destinations,
+                      self._steps):
+            array[:count] = array[:n][running]
+        for move in finished_moves:
+            move._finished()
+
+def _merge_move(last_moves, sprite, x, y, version):
+    """Record in _last_moves_ a move of _sprite_ from (_x_, _y_).
+
+    When _sprite_ was moved several times, the origin of its earliest move
+    and its latest version are kept.
+    """
+    move = last_moves.get(sprite)
+    if move is None:
+        last_moves[sprite] = (x, y, version)
+        return
+    x0, y0, version0 = move
+    if version < version0: # moved earlier in the step
+        last_moves[sprite] = (x, y, version0)
+    else:
+        last_moves[sprite] = (x0, y0, version)
+
 # The time a sprite takes to move from one point from another.
 SPRITE_MOVE_DURATION = 0.02 # seconds
 
 class PhysicalEngine:
 
-    def __init__(self, delta_time=0.01):
+    DEFAULT_DELTA_TIME = 0.01
+
+    def __init__(self, delta_time=DEFAULT_DELTA_TIME, vectorized=False):
         """
         Parameters:
         - delta_time: duration in seconds of one physic simulation step.
+          Moves shorter than one step (see SPRITE_MOVE_DURATION) are done in
+          a single step.
+        - vectorized: whether to run sprite moves in a MotionStore (requires
+          NumPy) rather than one system per move.
         """
+        if not delta_time > 0:
+            raise ValueError(
+                f"delta_time must be strictly positive, not {delta_time}")
         self._delta_time = delta_time
-        assert SPRITE_MOVE_DURATION > self._delta_time, "SPRITE_MOVE_DURATION must be higher than simulation delta-time"
         self._time = 0 # Total simulated time elapsed since the simulation boot
-        self._running_systems = []
+        # Running systems, as an insertion-ordered set so that they are run
+        # in the order they were started and removed in constant time.
+        self._active_systems = {}
+        # Systems finished by the last step.
+        self._finished_systems = []
+        self._motions = MotionStore() if vectorized else None
 
     @property
     def delta_time(self):
@@ -54,55 +288,92 @@ class PhysicalEngine:
     def time(self):
         return self._time
 
+    @property
+    def last_moves(self):
+        """Map the sprites moved by the last step to their top-left corner
+        before it and their version after it, as (x, y, version).
+
+        Used to interpolate the sprites' position between the last two
+        steps. A sprite whose version differs has changed since the step.
+        """
+        last_moves = {}
+        for systems in (self._active_systems, self._finished_systems):
+            for system in systems:
+                if system._from_x is not None:
+                    _merge_move(last_moves, system._sprite, system._from_x,
+                                system._from_y, system._version)
+        if self._motions is not None:
+            for sprite, (x, y, version) in self._motions.last_moves.items():
+                _merge_move(last_moves, sprite, x, y, version)
+        return last_moves
+
     def step(self):
         """Simulate one step of physical time."""
         ### Run systems
-        still_running_systems = []
-        for running_system in self._running_systems:
-            if not running_system.is_finished:
-                running_system._step()
-                still_running_systems.append(running_system)
-        self._running_systems = still_running_systems
+        finished_systems = self._finished_systems
+        finished_systems.clear()
+        for system in self._active_systems:
+            if system._step():
+                finished_systems.append(system)
+        for system in finished_systems:
+            del self._active_systems[system]
+            system._finished()
+        if self._motions is not None:
+            self._motions.step()
         # Must be the last statement
         self._time += self._delta_time
 
+    def _start_move(self, sprite, velocity_x, velocity_y,
+                    destination_x, destination_y, step_count):
+        """Return a handle on the move (see Move) whose is_finished
+        attribute tells whether it is done.
+        """
+        if self._motions is not None:
+            return self._motions.add(sprite, velocity_x, velocity_y,
+                                     destination_x, destination_y, step_count)
+        system = SpriteMoveSystem(sprite, velocity_x, velocity_y,
+                                  destination_x, destination_y, step_count)
+        if not system.is_finished:
+            self._active_systems[system] = None
+        return system
+
     def move_sprite(self, sprite, step, duration=None):
+        p = sprite.position
         if step == 0:
-            system = SpriteMoveSystem(sprite, Point.null(), sprite.position, 0)
-        else:
-            step_count = self._get_step_count(duration)
-            velocity = sprite.get_velocity_from_direction()
-            destination = sprite.position + step * velocity
-            inc_step = step / step_count
-            velocity *= inc_step
-            system = SpriteMoveSystem(sprite, velocity, destination, step_count)
-        self._running_systems.append(system)
-        return system
+            return self._start_move(sprite, 0, 0, p.x, p.y, 0)
+        step_count = self._get_step_count(duration)
+        velocity = sprite.get_velocity_from_direction()
+        inc_step = step / step_count
+        return self._start_move(sprite,
+                                velocity.x * inc_step, velocity.y * inc_step,
+                                p.x + step * velocity.x,
+                                p.y + step * velocity.y,
+                                step_count)
 
     def move_sprite_by(self, sprite, velocity, duration=None):
+        p = sprite.position
         if velocity.is_null:
-            system = SpriteMoveSystem(sprite, velocity, sprite.position, 0)
-        else:
-            destination = sprite.position + velocity
-            step_count = self._get_step_count(duration)
-            velocity /= step_count
-            system = SpriteMoveSystem(sprite, velocity / step_count, destination, step_count)
-        self._running_systems.append(system)
-        return system
+            return self._start_move(sprite, 0, 0, p.x, p.y, 0)
+        step_count = self._get_step_count(duration)
+        return self._start_move(sprite,
+                                velocity.x / step_count,
+                                velocity.y / step_count,
+                                p.x + velocity.x, p.y + velocity.y,
+                                step_count)
 
     def move_sprite_to(self, sprite, position,
                        duration=None):
         x, y = position
+        p = sprite.position
         if x is None:
-            x = sprite.position.x
+            x = p.x
         if y is None:
-            y = sprite.position.y
-        destination = math.Point(x, y)
+            y = p.y
         step_count = self._get_step_count(duration)
-        velocity = (destination - sprite.position) / step_count
-        system = SpriteMoveSystem(sprite, velocity, destination, step_count)
-        self._running_systems.append(system)
-        return system
+        return self._start_move(sprite,
+                                (x - p.x) / step_count,
+                                (y - p.y) / step_count,
+                                x, y, step_count)
 
     def _get_step_count(self, duration):
         if duration is None:
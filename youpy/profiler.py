@@ -0,0 +1,132 @@
+# -*- encoding: utf-8 -*-
+"""Measure where the frame time goes.
+"""
+
+
+import csv
+import json
+from collections import deque
+from contextlib import nullcontext
+from pathlib import Path
+from time import perf_counter
+
+
+class _PhaseTimer:
+    """Context manager accumulating the duration of a phase in the current
+    frame.
+
+    Reused for every measure of its phase. Thus, it is not re-entrant.
+    """
+
+    __slots__ = ("_durations", "_index", "_start")
+
+    def __init__(self, durations, index):
+        self._durations = durations
+        self._index = index
+        self._start = 0
+
+    def __enter__(self):
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._durations[self._index] += perf_counter() - self._start
+        return False
+
+class FrameProfiler:
+    """Record the duration of each phase of the last frames.
+
+    Phases may be measured several times per frame (e.g. requests are served
+    at every physics step): their durations are summed. Frames are kept in a
+    ring buffer of _capacity_ frames.
+    """
+
+    PHASES = ("trigger", "user_input", "collect", "run", "rip", "physics",
+              "render", "flip")
+
+    DEFAULT_CAPACITY = 600
+
+    enabled = True
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self._frames = deque(maxlen=capacity)
+        self._count = 0
+        self._durations = [0.0] * len(self.PHASES)
+        self._timers = {
+            phase: _PhaseTimer(self._durations, i)
+            for i, phase in enumerate(self.PHASES)}
+        self._frame_start = perf_counter()
+
+    def measure(self, phase):
+        """Return a context manager measuring _phase_ of the current frame."""
+        return self._timers[phase]
+
+    def end_frame(self):
+        """Record the current frame and start a new one."""
+        t = perf_counter()
+        self._frames.append((self._count, t - self._frame_start,
+                             *self._durations))
+        self._count += 1
+        self._frame_start = t
+        for i in range(len(self._durations)):
+            self._durations[i] = 0.0
+
+    @property
+    def columns(self):
+        return ("frame", "frame_time") + self.PHASES
+
+    def __len__(self):
+        return len(self._frames)
+
+    def __iter__(self):
+        """Iterate over the recorded frames, oldest first.
+
+        Each frame is a tuple of values in the order of columns. Durations
+        are in seconds.
+        """
+        return iter(self._frames)
+
+    def averages(self, count=None):
+        """Return the average duration of each phase over the last _count_
+        frames (all recorded frames by default), by phase name.
+        """
+        frames = list(self._frames)
+        if count is not None:
+            frames = frames[-count:]
+        if not frames:
+            return dict.fromkeys(self.PHASES, 0.0)
+        return {phase: sum(f[i] for f in frames) / len(frames)
+                for i, phase in enumerate(self.PHASES, start=2)}
+
+    def write_csv(self, stream):
+        writer = csv.writer(stream)
+        writer.writerow(self.columns)
+        writer.writerows(self._frames)
+
+    def write_json(self, stream):
+        json.dump([dict(zip(self.columns, frame)) for frame in self._frames],
+                  stream, indent=1)
+
+    def save(self, path):
+        """Save the recorded frames to _path_ as JSON if its suffix is .json
+        or as CSV otherwise.
+        """
+        path = Path(path)
+        with path.open("w", newline="") as stream:
+            if path.suffix == ".json":
+                self.write_json(stream)
+            else:
+                self.write_csv(stream)
+
+class NullProfiler:
+    """Profiler measuring nothing, at almost no cost."""
+
+    enabled = False
+
+    _NULL_CONTEXT = nullcontext()
+
+    def measure(self, phase):
+        return self._NULL_CONTEXT
+
+    def end_frame(self):
+        pass
@@ -6,6 +6,7 @@
 from youpy.tools import extended_sys_path
 from youpy.engine import Engine
 from youpy.engine import Simulation
+from youpy.physics import PhysicalEngine
 from youpy.project import Project
 from youpy.project import get_project_dir
 from youpy import logging
@@ -14,6 +15,9 @@ LOGGER = logging.getLogger(__name__)
 
 def run(path,
         show_fps=False, fps=30,
+        headless=False, throttle=True, time_limit=None, render_thread=False,
+        interpolate=False, physics_step=PhysicalEngine.DEFAULT_DELTA_TIME,
+        vectorized_physics=False, adaptive_fps=True, profile=None,
         log_level=None, syslog_level=None, log_context=False):
     project_dir = get_project_dir(path)
     project = Project(project_dir)
@@ -21,7 +25,17 @@ def run(path,
                         log_context=log_context)
     LOGGER.info("=" * 60)
     LOGGER.info(f"running {project.name}")
-    simu = Simulation(project, show_fps=show_fps)
-    engine = Engine(simu, target_fps=fps)
+    simu = Simulation(project, show_fps=show_fps, headless=headless,
+                      render_thread=render_thread, interpolate=interpolate,
+                      delta_time=physics_step,
+                      vectorized_physics=vectorized_physics,
+                      profile=profile is not None)
+    engine = Engine(simu, target_fps=fps, throttle=throttle,
+                    time_limit=time_limit, adaptive_fps=adaptive_fps)
     with extended_sys_path(project_dir.parent):
-        return engine.run()
+        try:
+            return engine.run()
+        finally:
+            if profile is not None:
+                simu.profiler.save(profile)
+                LOGGER.info(f"frame profile saved to {profile}")
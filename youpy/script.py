@@ -23,6 +23,10 @@ class ScriptSet:
     def __init__(self):
         self._scripts = {}
         self._done_scripts = concurrency.Queue()
+        # Requests of all scripts, tagged by their sender.
+        self._requests = concurrency.Queue()
+        # Set by scripts whenever they need the engine's attention.
+        self._wakeup = concurrency.Event()
 
     def bulk_trigger(self, event_handlers):
         for event_handler in event_handlers:
@@ -35,11 +39,14 @@ class ScriptSet:
             # event handler run slower than the pace of repeated key stroke.
             # In such a case, we just drop some event.
             return
-        script = Script(event_handler, done_queue=self._done_scripts)
+        script = Script(event_handler, done_queue=self._done_scripts,
+                        request_queue=self._requests, wakeup=self._wakeup)
         self._scripts[script.name] = script
         script.start()
 
     def rip_done_scripts(self):
+        """Remove the terminated scripts and return them."""
+        done_scripts = []
         while True:
             try:
                 script = self._done_scripts.get(block=False)
@@ -47,9 +54,32 @@ class ScriptSet:
                 break
             else:
                 del self._scripts[script.name]
+                done_scripts.append(script)
                 if script.exc_info is not None:
                     print(f"*** Exception in thread {script.name}")
                     traceback.print_exception(*script.exc_info)
+        return done_scripts
+
+    def iter_requests(self):
+        """Yield the (script, request, wants_reply) tuples sent so far, in
+        arrival order.
+        """
+        while True:
+            try:
+                yield self._requests.get(block=False)
+            except concurrency.EmptyQueue:
+                break
+
+    def wait(self, timeout=None):
+        """Block until a script sends a request or terminates.
+
+        Return False if _timeout_ expired before that.
+        """
+        woken_up = self._wakeup.wait(timeout)
+        # Clear before the caller processes the requests so that one sent
+        # meanwhile is not missed.
+        self._wakeup.clear()
+        return woken_up
 
     def join(self, timeout=1.0):
         self._stop_all_scripts()
@@ -87,11 +117,18 @@ class Script(concurrency.Task):
 
     context = concurrency.get_context()
 
-    def __init__(self, event_handler, done_queue=None):
+    # Number of requests a script can post before being forced to wait for
+    # the engine to catch up.
+    MAX_POSTED_REQUESTS = concurrency.Pipe.MAXSIZE
+
+    def __init__(self, event_handler, done_queue=None, request_queue=None,
+                 wakeup=None):
         super().__init__(name=get_script_name(event_handler), daemon=True)
         self.event_handler = event_handler
-        self.pipe = concurrency.Pipe()
+        self.pipe = concurrency.Pipe(request_queue=request_queue)
         self._done_queue = done_queue
+        self._wakeup = wakeup
+        self._posted_count = 0
         self.exc_info = None
 
     def run(self):
@@ -100,6 +137,9 @@ class Script(concurrency.Task):
             self.context.frontend_sprite = Sprite(self.event_handler.sprite)
         try:
             self._run()
+            # Report errors of posted requests not synchronized yet.
+            if self._posted_count > 0:
+                self.sync()
         except StopScript:
             pass
         except Exception as exc:
@@ -107,6 +147,11 @@ class Script(concurrency.Task):
         finally:
             if self._done_queue is not None:
                 self._done_queue.put(self, block=False)
+            self._wake_up_engine()
+
+    def _wake_up_engine(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
 
     def _run(self):
         if self.event_handler.in_stage:
@@ -122,12 +167,40 @@ class Script(concurrency.Task):
                 raise TypeError(f"too many parameters defined for event handler '{self.event_handler_name}'")
 
     def send(self, request):
-        self.pipe.request_queue.put(request)
+        """Send _request_ to the engine and wait for its reply.
+
+        Raise the error of any previously posted request that failed.
+        """
+        self.pipe.request_queue.put((self, request, True))
+        self._wake_up_engine()
         reply = self.pipe.reply_queue.get()
+        self._posted_count = 0
         if isinstance(reply, Exception):
             raise reply
         return reply
 
+    def post(self, request):
+        """Send _request_ to the engine without waiting for its reply.
+
+        If processing the request fails, the error is raised by the next call
+        to send(). Requests posted in between are discarded.
+        """
+        if self._posted_count >= self.MAX_POSTED_REQUESTS:
+            self.send(request)
+            return
+        self.pipe.request_queue.put((self, request, False))
+        self._posted_count += 1
+        self._wake_up_engine()
+
+    @property
+    def has_posted_requests(self):
+        """Whether some posted requests may not have been processed yet."""
+        return self._posted_count > 0
+
+    def sync(self):
+        """Wait for all the posted requests to be processed."""
+        self.send(message.Sync())
+
 _MOUSE = None
 _SCENE = None
 
@@ -155,6 +228,10 @@ def send_request(request):
     """Send a request to the engine server."""
     return get_context_script().send(request)
 
+def post_request(request):
+    """Send a request to the engine server without waiting for its reply."""
+    get_context_script().post(request)
+
 
 class Scene:
     """Scene holds properties of the stage.
@@ -220,8 +297,8 @@ from youpy.math import Point
 # o Client-side version of the EngineSprite.
 # o Parse and check arguments to provide a user-friendly API to users.
 # o Do coordinate/angle conversion to honor users preferences.
-# Maybe later:
-# o Cache local state to reduce engine loads.
+# o Read the engine's state snapshot locally when it is up-to-date to reduce
+#   engine loads.
 class Sprite:
     """A drawn object on stage that can move and collide.
     """
@@ -317,7 +394,7 @@ class Sprite:
 
     def point_in_direction(self, angle):
         self._scene.anglesys.check_angle(angle)
-        send_request(message.SpriteOp(
+        post_request(message.SpriteOp(
             name=self.name,
             op="point_in_direction",
             args=(self._scene.anglesys.to_degree(angle),)))
@@ -342,10 +419,18 @@ class Sprite:
         send_request(message.SpriteMove(name=self.name, step=step))
 
     def _get_state(self):
-        return send_request(message.SpriteOp(name=self.name, op="get_state"))
+        # The engine publishes the snapshot after each simulation step. It is
+        # outdated as long as the engine may not have processed our posted
+        # requests, or once the sprite changed.
+        state = self._engine_sprite.state
+        if state is None or get_context_script().has_posted_requests:
+            state = send_request(message.SpriteOp(name=self.name,
+                                                  op="get_state"))
+        return state
 
     def position(self):
-        return self._scene.coordsys.point_to(self._get_state().position).tuple
+        st = self._get_state()
+        return self._scene.coordsys.point_to(Point(st.x, st.y)).tuple
 
     def x_position(self):
         return self.position()[0]
@@ -359,28 +444,27 @@ class Sprite:
     def bounce_if_on_edge(self):
         st = self._get_state()
         angle_degree = st.direction
-        r = st.rect
         scene = self._scene
-        if r.left < 0 or r.right > scene.width: # vertical edges
+        if st.left < 0 or st.right > scene.width: # vertical edges
             new_angle = math.atan2(math.fast_sin(angle_degree),
                                    -math.fast_cos(angle_degree))
-            if r.left < 0:
-                dx = -r.left
+            if st.left < 0:
+                dx = -st.left
             else:
-                dx = scene.width - r.right
+                dx = scene.width - st.right
             dy = int(round(dx * math.tan(new_angle)))
-        elif r.top < 0 or r.bottom > scene.height: # horizontal edges
+        elif st.top < 0 or st.bottom > scene.height: # horizontal edges
             new_angle = math.atan2(-math.fast_sin(angle_degree),
                                    math.fast_cos(angle_degree))
-            if r.top < 0:
-                dy = r.top
+            if st.top < 0:
+                dy = st.top
             else:
-                dy = r.bottom - scene.height
+                dy = st.bottom - scene.height
             dx = int(round(dy * math.tan(new_angle)))
         else: # no collision
             return
         new_angle_degree = int(round(math.radian_to_degree(new_angle))) % 360
-        # print(f"{angle_degree=};{new_angle=};{new_angle_degree=};{r=};{dx=};{dy=}")
+        # print(f"{angle_degree=};{new_angle=};{new_angle_degree=};{st=};{dx=};{dy=}")
         send_request(message.SpriteBatchOp(
             name=self.name,
             ops=(
@@ -391,7 +475,7 @@ class Sprite:
 
     def turn_counter_clockwise(self, angle):
         self._scene.anglesys.check_angle(angle)
-        send_request(message.SpriteOp(
+        post_request(message.SpriteOp(
             name=self.name,
             op="turn_counter_clockwise",
             args=(angle,)))
@@ -401,17 +485,32 @@ class Sprite:
 
     def show(self):
         """Show the current sprite."""
-        send_request(message.SpriteOp(name=self.name, op="show"))
+        post_request(message.SpriteOp(name=self.name, op="show"))
 
     def hide(self):
         """Hide the current sprite."""
-        send_request(message.SpriteOp(name=self.name, op="hide"))
+        post_request(message.SpriteOp(name=self.name, op="hide"))
 
     def touched_objects(self):
         return send_request(message.SpriteGetCollision(name=self.name))
 
     def touching(self, object):
-        return object in self.touched_objects()
+        return self.touching_each(object)[0]
+
+    def touching_each(self, *objects):
+        """Tell whether this sprite touches each of the given _objects_.
+
+        Return a tuple of booleans in the same order as _objects_, all
+        computed by the engine at once. Each object is either a sprite name
+        or the stage edge, otherwise TypeError is raised. An unknown sprite
+        name is never touched.
+        """
+        for obj in objects:
+            if obj is not self._scene.EDGE and not isinstance(obj, str):
+                raise TypeError("object must be str or the stage edge, not {}"
+                                .format(type(obj).__name__))
+        return send_request(message.SpriteTouching(name=self.name,
+                                                   targets=objects))
 
     def glide(self, duration, to=None):
         if not isinstance(duration, (int, float)):
@@ -436,18 +535,18 @@ class Sprite:
             duration=duration))
 
     def go_to_front_layer(self):
-        send_request(message.SpritesListOp(op="go_to_front_layer",
+        post_request(message.SpritesListOp(op="go_to_front_layer",
                                            args=(self.name,)))
 
     def go_to_back_layer(self):
-        send_request(message.SpritesListOp(op="go_to_back_layer",
+        post_request(message.SpritesListOp(op="go_to_back_layer",
                                            args=(self.name,)))
 
     def change_layer_by(self, shift):
         if not isinstance(shift, int):
             raise TypeError("shift must be int, not {}"
                             .format(type(shift).__name__))
-        send_request(message.SpritesListOp(op="change_layer_by",
+        post_request(message.SpritesListOp(op="change_layer_by",
                                            args=(self.name, shift)))
 
 class Mouse:
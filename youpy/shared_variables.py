@@ -37,7 +37,7 @@ class SharedVariable:
         return self
 
     def _set_changed(self):
-        self._set._changed = True
+        self._set._set_changed()
 
 class SharedVariableSet(MutableMapping):
 
@@ -47,13 +47,16 @@ class SharedVariableSet(MutableMapping):
 
     def __setitem__(self, name, value):
         self._d[name] = SharedVariable(self, value)
-        self._changed = True
+        self._set_changed()
 
     def __getitem__(self, name):
         return self._d[name]
 
     def __delitem__(self, name):
         del self._d[name]
+        self._set_changed()
+
+    def _set_changed(self):
         self._changed = True
 
     def __iter__(self):
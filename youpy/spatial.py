@@ -0,0 +1,88 @@
+# -*- encoding: utf-8 -*-
+"""Spatial indexes used to speed-up collision detection.
+"""
+
+
+from collections import defaultdict
+
+
+class UniformGrid:
+    """Broad-phase spatial index bucketing objects by the square cells their
+    bounding rect overlaps.
+
+    Queries return the set of objects whose cells overlap the queried area.
+    It is a super-set of the objects actually colliding with it; callers must
+    test them precisely.
+    """
+
+    DEFAULT_CELL_SIZE = 64 # pixels
+
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE):
+        if not isinstance(cell_size, int):
+            raise TypeError("cell_size must be int, not {}"
+                            .format(type(cell_size).__name__))
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self._cell_size = cell_size
+        self._cells = defaultdict(set)
+        # Range of cells each object is registered in.
+        self._ranges = {}
+
+    @property
+    def cell_size(self):
+        return self._cell_size
+
+    def __len__(self):
+        return len(self._ranges)
+
+    def __contains__(self, obj):
+        return obj in self._ranges
+
+    def _get_range(self, rect):
+        cs = self._cell_size
+        # Right and bottom edges are excluded from pygame's rects.
+        return (rect.left // cs, rect.top // cs,
+                max(rect.left, rect.right - 1) // cs,
+                max(rect.top, rect.bottom - 1) // cs)
+
+    def _iter_cells(self, cell_range):
+        x0, y0, x1, y1 = cell_range
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                yield (x, y)
+
+    def insert(self, obj, rect):
+        if obj in self._ranges:
+            raise ValueError(f"object already indexed: {obj!r}")
+        cell_range = self._get_range(rect)
+        self._ranges[obj] = cell_range
+        for cell in self._iter_cells(cell_range):
+            self._cells[cell].add(obj)
+
+    def remove(self, obj):
+        cell_range = self._ranges.pop(obj)
+        for cell in self._iter_cells(cell_range):
+            objs = self._cells[cell]
+            objs.discard(obj)
+            if not objs:
+                del self._cells[cell]
+
+    def update(self, obj, rect):
+        """Move _obj_ to _rect_. Cheap when it stays in the same cells."""
+        if self._ranges.get(obj) == self._get_range(rect):
+            return
+        self.remove(obj)
+        self.insert(obj, rect)
+
+    def query_rect(self, rect):
+        result = set()
+        for cell in self._iter_cells(self._get_range(rect)):
+            objs = self._cells.get(cell)
+            if objs:
+                result.update(objs)
+        return result
+
+    def query_point(self, point):
+        cs = self._cell_size
+        objs = self._cells.get((point[0] // cs, point[1] // cs))
+        return set(objs) if objs else set()
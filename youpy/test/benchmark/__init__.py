@@ -0,0 +1,7 @@
+# -*- encoding: utf-8 -*-
+"""Youpy's micro-benchmarks.
+
+They are not part of the test suite. Run them individually like this:
+
+    python -m youpy.test.benchmark.bench_get_state
+"""
@@ -0,0 +1,67 @@
+# -*- encoding: utf-8 -*-
+"""Helpers shared by the micro-benchmarks.
+"""
+
+
+import os
+import tracemalloc
+from timeit import timeit
+from tempfile import TemporaryDirectory
+from contextlib import contextmanager
+
+import pygame
+
+from youpy.data import EngineScene
+from youpy.data import EngineSprite
+from youpy.math import CoordSys
+
+
+@contextmanager
+def make_sprites(count, size=(10, 10)):
+    """Yield _count_ EngineSprite without image on a 'center' coordinates
+    scene.
+    """
+    with TemporaryDirectory() as tmpdir:
+        scene = EngineScene()
+        scene.coordsys = CoordSys.get_system("center")(scene.center)
+        sprites = []
+        for i in range(count):
+            sprite_dir = os.path.join(tmpdir, f"Sprite{i}")
+            os.mkdir(sprite_dir)
+            sprite = EngineSprite(sprite_dir, scene=scene)
+            sprite.rect = pygame.Rect((0, 0), size)
+            sprites.append(sprite)
+        yield sprites
+
+@contextmanager
+def make_sprite(size=(10, 10)):
+    """Yield an EngineSprite without image on a 'center' coordinates scene."""
+    with make_sprites(1, size=size) as sprites:
+        yield sprites[0]
+
+def measure_time(func, number=100000):
+    """Return the average duration of a call to _func_ in micro-seconds."""
+    return timeit(func, number=number) / number * 1e6
+
+def measure_memory(func, number=1000):
+    """Return the average peak memory allocated by a call to _func_ in bytes.
+
+    Memory allocated but freed before the end of the call is accounted.
+    """
+    total = 0
+    tracemalloc.start()
+    try:
+        for _ in range(number):
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+            total += peak - base
+    finally:
+        tracemalloc.stop()
+    return total / number
+
+def report(name, func):
+    duration = measure_time(func)
+    memory = measure_memory(func)
+    print(f"{name:>24s}: {duration:8.3f} µs/call {memory:10.1f} bytes/call")
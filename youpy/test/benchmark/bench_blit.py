@@ -0,0 +1,45 @@
+# -*- encoding: utf-8 -*-
+"""Benchmark blitting images loaded as is versus converted to the display
+pixel format.
+"""
+
+
+import os
+
+import pygame
+
+from youpy.data import to_display_format
+from youpy.test.benchmark._internal import measure_time
+
+
+def make_images(size):
+    """Return an opaque and a per-pixel alpha surface as image loading would
+    (24 bits RGB and 32 bits RGBA).
+    """
+    opaque = pygame.Surface(size, depth=24)
+    opaque.fill((30, 120, 200))
+    alpha = pygame.Surface(size, pygame.SRCALPHA)
+    alpha.fill((0, 0, 0, 0))
+    pygame.draw.circle(alpha, (255, 0, 0, 255),
+                       (size[0] // 2, size[1] // 2), min(size) // 2)
+    return opaque, alpha
+
+def main():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    try:
+        display = pygame.display.set_mode((480, 360))
+        for name, size in (("costume", (64, 64)), ("backdrop", (480, 360))):
+            for kind, surface in zip(("opaque", "alpha"), make_images(size)):
+                converted = to_display_format(surface)
+                raw = measure_time(lambda: display.blit(surface, (0, 0)),
+                                   number=2000)
+                fast = measure_time(lambda: display.blit(converted, (0, 0)),
+                                    number=2000)
+                print(f"{name:>8s} {kind:>6s}: {raw:8.2f} µs/blit as loaded"
+                      f" {fast:8.2f} µs/blit converted")
+    finally:
+        pygame.display.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+# -*- encoding: utf-8 -*-
+"""Benchmark collision queries for an increasing number of sprites.
+
+Compare a linear scan of all the sprites to the spatial index of SpritesList.
+"""
+
+
+from random import Random
+
+from youpy.engine import SpritesList
+from youpy.test.benchmark._internal import make_sprites
+from youpy.test.benchmark._internal import measure_time
+
+
+def linear_scan(sprites, sprite):
+    return [other.name for other in sprites if sprite.rect.colliderect(other.rect)]
+
+def indexed(sprites, sprite):
+    return [other.name for other in sprites.iter_overlapping(sprite.rect)]
+
+def main():
+    rand = Random(42)
+    for count in (10, 100, 1000, 5000):
+        with make_sprites(count) as sprite_objs:
+            sprites = SpritesList()
+            for sprite in sprite_objs:
+                sprite.go_to(rand.randrange(480), rand.randrange(360))
+                sprites.add(sprite)
+            probe = sprite_objs[0]
+            assert sorted(linear_scan(sprites, probe)) \
+                == sorted(indexed(sprites, probe))
+            number = max(10, 10000 // count)
+            linear = measure_time(lambda: linear_scan(sprites, probe), number)
+            grid = measure_time(lambda: indexed(sprites, probe), number)
+            print(f"{count:6d} sprites: linear {linear:9.2f} µs/query ; "
+                  f"grid {grid:7.2f} µs/query")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+# -*- encoding: utf-8 -*-
+"""Benchmark the construction of EngineSprite's state snapshot.
+
+Compare the SpriteState snapshot to the former implementation defining a
+class at every call.
+"""
+
+
+from youpy.test.benchmark._internal import make_sprite
+from youpy.test.benchmark._internal import report
+
+
+def class_based_get_state(sprite):
+    # Former implementation of EngineSprite.get_state.
+    class State:
+        visible = sprite._visible
+        rect = sprite._rect.copy()
+        position = sprite._position.copy()
+        direction = sprite.direction()
+    return State()
+
+def main():
+    with make_sprite() as sprite:
+        def build_class_based():
+            return class_based_get_state(sprite)
+        def build_snapshot():
+            sprite._changed() # defeat the cache
+            return sprite.get_state()
+        def cached_snapshot():
+            return sprite.get_state()
+        report("class-based", build_class_based)
+        report("SpriteState", build_snapshot)
+        report("SpriteState (cached)", cached_snapshot)
+
+if __name__ == "__main__":
+    main()
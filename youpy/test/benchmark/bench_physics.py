@@ -0,0 +1,64 @@
+# -*- encoding: utf-8 -*-
+"""Benchmark a physics step while many sprites glide: one system per move
+versus the vectorized motion store.
+
+Also track the memory allocated by a step, which should barely grow with the
+number of moving sprites.
+"""
+
+
+from youpy.engine import SpritesList
+from youpy.physics import PhysicalEngine
+from youpy.physics import numpy
+from youpy.test.benchmark._internal import make_sprites
+from youpy.test.benchmark._internal import measure_time
+from youpy.test.benchmark._internal import measure_memory
+
+
+STEPS = 100
+
+def glide_all(sprites, vectorized):
+    """Return a function running STEPS steps of _sprites_ gliding."""
+    def run():
+        engine = PhysicalEngine(vectorized=vectorized)
+        for i, sprite in enumerate(sprites):
+            sprite.go_to(0, 0)
+            engine.move_sprite_to(sprite, (i % 200, i % 150),
+                                  duration=STEPS * engine.delta_time)
+        for _ in range(STEPS):
+            engine.step()
+    return run
+
+def gliding_engine(sprites, vectorized):
+    """Return a physics engine whose _sprites_ glide for a long time."""
+    engine = PhysicalEngine(vectorized=vectorized)
+    for i, sprite in enumerate(sprites):
+        sprite.go_to(0, 0)
+        engine.move_sprite_to(sprite, (i % 200, i % 150), duration=1000)
+    engine.step() # warm up
+    return engine
+
+def main():
+    for count in (10, 100, 1000, 5000):
+        with make_sprites(count) as sprites:
+            sprites_list = SpritesList()
+            for sprite in sprites:
+                sprites_list.add(sprite)
+            line = f"{count:>5d} sprites:"
+            modes = (False, True) if numpy is not None else (False,)
+            for vectorized in modes:
+                duration = measure_time(glide_all(sprites, vectorized),
+                                        number=5) / STEPS
+                name = "vectorized" if vectorized else "systems"
+                line += f" {duration:10.1f} µs/step {name}"
+            print(line)
+            line = f"{count:>5d} sprites:"
+            for vectorized in modes:
+                engine = gliding_engine(sprites, vectorized)
+                memory = measure_memory(engine.step, number=100)
+                name = "vectorized" if vectorized else "systems"
+                line += f" {memory:10.1f} bytes/step {name}"
+            print(line)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# -*- encoding: utf-8 -*-
+"""Benchmark rendering every sprite one blit at a time versus a single call
+to Surface.blits() with the cached blit sequence.
+"""
+
+
+import os
+
+import pygame
+
+from youpy.engine import SpritesList
+from youpy.test.benchmark._internal import make_sprites
+from youpy.test.benchmark._internal import measure_time
+
+
+class _Image:
+
+    def __init__(self, surface):
+        self.surface = surface
+
+def per_sprite_render(surface, sprites):
+    # Former implementation of Renderer._render_sprites.
+    for sprite in sprites:
+        if not sprite.visible:
+            continue
+        surface.blit(sprite.current_image.surface, sprite.rect)
+
+def main():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    try:
+        display = pygame.display.set_mode((480, 360))
+        costume = pygame.Surface((8, 8)).convert()
+        for count in (10, 100, 1000, 5000):
+            with make_sprites(count, size=(8, 8)) as sprites:
+                sprites_list = SpritesList()
+                for i, sprite in enumerate(sprites):
+                    sprite.images = [_Image(costume)]
+                    sprite._index = 0
+                    sprite.go_to(i % 480 - 240, i % 360 - 180)
+                    sprites_list.add(sprite)
+                loop = measure_time(
+                    lambda: per_sprite_render(display, sprites_list),
+                    number=200)
+                batched = measure_time(
+                    lambda: display.blits(sprites_list.blit_sequence(),
+                                          doreturn=False),
+                    number=200)
+                print(f"{count:>5d} sprites: {loop:10.1f} µs/frame per sprite"
+                      f" {batched:10.1f} µs/frame batched")
+    finally:
+        pygame.display.quit()
+
+if __name__ == "__main__":
+    main()
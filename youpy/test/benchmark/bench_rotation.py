@@ -0,0 +1,37 @@
+# -*- encoding: utf-8 -*-
+"""Benchmark rotating a costume at every frame versus looking it up in the
+transform cache.
+"""
+
+
+import pygame
+
+from youpy.data import TransformCache
+from youpy.data import TransformedImage
+from youpy.test.benchmark._internal import measure_time
+
+
+def main():
+    surface = pygame.Surface((64, 64), pygame.SRCALPHA)
+    pygame.draw.circle(surface, (255, 0, 0, 255), (32, 32), 32)
+    image = TransformedImage(surface)
+    angles = range(0, 360, 7)
+    def rotozoom():
+        for angle in angles:
+            pygame.transform.rotozoom(surface, angle, 1.0)
+    def rotate():
+        for angle in angles:
+            pygame.transform.rotate(surface, angle)
+    cache = TransformCache()
+    def cached():
+        for angle in angles:
+            cache.rotated(image, angle)
+    cached() # warm up
+    count = len(angles)
+    for name, func in (("rotozoom", rotozoom), ("rotate", rotate),
+                       ("TransformCache", cached)):
+        duration = measure_time(func, number=100) / count
+        print(f"{name:>16s}: {duration:8.2f} µs/rotation")
+
+if __name__ == "__main__":
+    main()
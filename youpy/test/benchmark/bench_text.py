@@ -0,0 +1,35 @@
+# -*- encoding: utf-8 -*-
+"""Benchmark rendering a shared variable panel whose value changes at every
+frame: full Font.render versus a cached label and a cached value.
+"""
+
+
+import itertools
+
+import pygame
+
+from youpy.engine import TextCache
+from youpy.test.benchmark._internal import measure_time
+
+
+def main():
+    pygame.font.init()
+    try:
+        font = pygame.font.Font(pygame.font.get_default_font(), 16)
+        cache = TextCache(font)
+        values = itertools.cycle(range(100))
+        def font_render():
+            font.render(f"score = {next(values)}", True, (255, 255, 255))
+        def cached():
+            cache.render("score = ")
+            cache.render(f"{next(values)}")
+        cached() # warm up
+        for name, func in (("Font.render", font_render),
+                           ("TextCache", cached)):
+            duration = measure_time(func, number=20000)
+            print(f"{name:>12s}: {duration:8.2f} µs/update")
+    finally:
+        pygame.font.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# -*- encoding: utf-8 -*-
+"""Helpers shared by the unit tests.
+"""
+
+
+import os
+import json
+import uuid
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from contextlib import contextmanager
+
+import pygame
+
+from youpy.engine import Simulation
+from youpy.engine import Engine
+from youpy.project import Project
+from youpy.project import INTERNAL_DIR
+from youpy.tools import extended_sys_path
+
+
+def write_image(path, size, color):
+    surface = pygame.Surface(size)
+    surface.fill(color)
+    pygame.image.save(surface, str(path))
+
+def write_project(root, sprites, stage_script="", config=None):
+    """Write a project in directory _root_ and return its path.
+
+    _sprites_ maps the name of each sprite to the source of its script. Each
+    sprite has a 10x10 costume of a different color. The stage has a gray
+    backdrop. _config_ is the content of the project's configuration file.
+    """
+    # The project name is the top-level package of its scripts: make it
+    # unique so that they are never shadowed by those of another test.
+    path = Path(root) / f"project_{uuid.uuid4().hex}"
+    (path / INTERNAL_DIR).mkdir(parents=True)
+    if config is not None:
+        with open(path / INTERNAL_DIR / "config.json", "w") as stream:
+            json.dump(config, stream)
+    stage_dir = path / Project.STAGE_DIR
+    stage_dir.mkdir()
+    write_image(stage_dir / "1_Backdrop.png", (480, 360), (128, 128, 128))
+    (stage_dir / "stage.py").write_text(stage_script)
+    for i, (name, source) in enumerate(sprites.items()):
+        sprite_dir = path / name
+        sprite_dir.mkdir()
+        write_image(sprite_dir / f"{name}.png", (10, 10),
+                    (255, 40 * i % 256, 0))
+        (sprite_dir / f"{name}.py").write_text(source)
+    return path
+
+@contextmanager
+def booted_simulation(sprites, stage_script="", config=None, **kwargs):
+    """Yield a booted headless Simulation of a project written by
+    write_project().
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    with TemporaryDirectory() as tmpdir:
+        path = write_project(tmpdir, sprites, stage_script=stage_script,
+                             config=config)
+        with extended_sys_path(path.parent):
+            simu = Simulation(Project(path), headless=True, **kwargs)
+            try:
+                simu.boot()
+                yield simu
+                simu.stop(reason="test done")
+                simu.shutdown()
+            finally:
+                simu.halt()
+
+def run_project(sprites, stage_script="", config=None, time_limit=1,
+                **kwargs):
+    """Run headless and unthrottled a project written by write_project()
+    for at most _time_limit_ simulated seconds.
+
+    Return the halted Simulation.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    with TemporaryDirectory() as tmpdir:
+        path = write_project(tmpdir, sprites, stage_script=stage_script,
+                             config=config)
+        with extended_sys_path(path.parent):
+            simu = Simulation(Project(path), headless=True, **kwargs)
+            Engine(simu, throttle=False, time_limit=time_limit).run()
+    return simu
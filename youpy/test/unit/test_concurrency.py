@@ -0,0 +1,28 @@
+# -*- encoding: utf-8 -*-
+"""
+"""
+
+
+import unittest
+
+from youpy.concurrency import Mailbox
+from youpy.concurrency import Task
+
+
+class TestMailbox(unittest.TestCase):
+
+    def test_latest_item_wins(self):
+        mailbox = Mailbox()
+        mailbox.put(1)
+        mailbox.put(2)
+        self.assertEqual(mailbox.get(), 2)
+
+    def test_get_waits_for_item(self):
+        mailbox = Mailbox()
+        items = []
+        task = Task(target=lambda: items.append(mailbox.get()))
+        task.start()
+        mailbox.put(42)
+        task.join(timeout=5)
+        self.assertFalse(task.is_alive())
+        self.assertEqual(items, [42])
@@ -0,0 +1,241 @@
+# -*- encoding: utf-8 -*-
+"""
+"""
+
+
+import unittest
+import os
+from tempfile import TemporaryDirectory
+
+import pygame
+
+from youpy.data import EngineScene
+from youpy.data import EngineSprite
+from youpy.data import SpriteState
+from youpy.data import Image
+from youpy.data import scale_image_by
+from youpy.data import to_display_format
+from youpy.data import TransformCache
+from youpy.math import CoordSys
+from youpy.engine import are_touching
+
+
+def save_disc_image(path, size=20):
+    """Save an image of an opaque disc on a transparent background."""
+    surface = pygame.Surface((size, size), pygame.SRCALPHA)
+    surface.fill((0, 0, 0, 0))
+    pygame.draw.circle(surface, (255, 0, 0, 255), (size // 2, size // 2),
+                       size // 2)
+    pygame.image.save(surface, path)
+
+
+class TestEngineSpriteState(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        path = os.path.join(self.tmpdir.name, "Sprite")
+        os.mkdir(path)
+        scene = EngineScene()
+        scene.coordsys = CoordSys.get_system("topleft")(scene.topleft)
+        self.sprite = EngineSprite(path, scene=scene)
+        self.sprite.rect = pygame.Rect(0, 0, 10, 20)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_snapshot(self):
+        self.sprite.go_to(5, 6)
+        st = self.sprite.get_state()
+        self.assertIsInstance(st, SpriteState)
+        self.assertEqual(st.position, (5, 6))
+        self.assertEqual((st.left, st.top, st.right, st.bottom),
+                         (5, 6, 15, 26))
+        self.assertTrue(st.visible)
+
+    def test_immutable(self):
+        st = self.sprite.get_state()
+        with self.assertRaises(AttributeError):
+            st.x = 42
+
+    def test_cached_until_changed(self):
+        st = self.sprite.get_state()
+        self.assertIs(self.sprite.state, st)
+        self.assertIs(self.sprite.get_state(), st)
+        self.sprite.hide()
+        self.assertIsNone(self.sprite.state)
+        new_st = self.sprite.get_state()
+        self.assertFalse(new_st.visible)
+        self.assertGreater(new_st.version, st.version)
+
+class TestImageMask(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "Disc.png")
+        save_disc_image(self.path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_mask_is_cached(self):
+        image = Image(self.path)
+        self.assertIs(image.mask, image.mask)
+        self.assertEqual(image.mask.get_size(), (20, 20))
+        # Corners are transparent.
+        self.assertEqual(image.mask.get_at((0, 0)), 0)
+        self.assertEqual(image.mask.get_at((10, 10)), 1)
+
+    def test_mask_updated_on_scale(self):
+        image = Image(self.path)
+        mask = image.mask
+        scale_image_by(image, ratio=200)
+        self.assertIsNot(image.mask, mask)
+        self.assertEqual(image.mask.get_size(), (40, 40))
+
+class TestTransformCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "Disc.png")
+        save_disc_image(self.path)
+        self.image = Image(self.path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_cached(self):
+        cache = TransformCache()
+        rotated = cache.rotated(self.image, 45)
+        self.assertIs(cache.rotated(self.image, 45.2), rotated)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertGreater(rotated.rect.width, self.image.rect.width)
+        self.assertIs(rotated.mask, rotated.mask)
+        self.assertIsNot(cache.flipped(self.image), rotated)
+
+    def test_bounded(self):
+        cache = TransformCache(maxsize=2)
+        first = cache.rotated(self.image, 10)
+        cache.rotated(self.image, 20)
+        cache.rotated(self.image, 10) # most recently used
+        cache.rotated(self.image, 30)
+        self.assertEqual(len(cache), 2)
+        self.assertIs(cache.rotated(self.image, 10), first)
+        self.assertEqual(cache.misses, 3)
+
+    def test_outdated_by_scale(self):
+        cache = TransformCache()
+        rotated = cache.rotated(self.image, 45)
+        scale_image_by(self.image, ratio=200)
+        self.assertIsNot(cache.rotated(self.image, 45), rotated)
+
+class TestEngineSpriteRotation(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        path = os.path.join(self.tmpdir.name, "Sprite")
+        os.mkdir(path)
+        image_path = os.path.join(path, "costume.png")
+        pygame.image.save(pygame.Surface((20, 10)), image_path)
+        scene = EngineScene()
+        scene.coordsys = CoordSys.get_system("center")(scene.center)
+        self.sprite = EngineSprite(path, scene=scene)
+        self.sprite.images = [Image(image_path)]
+        self.sprite._index = 0
+        self.sprite.rect = self.sprite.current_image.rect.copy()
+        self.sprite.go_to(0, 0)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_dont_rotate_by_default(self):
+        self.sprite.point_in_direction(45)
+        self.assertIs(self.sprite.surface,
+                      self.sprite.current_image.surface)
+        self.assertEqual(self.sprite.rect.size, (20, 10))
+
+    def test_all_around(self):
+        self.sprite.rotation_style = EngineSprite.ALL_AROUND
+        center = self.sprite.rect.center
+        self.sprite.point_in_direction(90)
+        self.assertEqual(self.sprite.rect.size, (10, 20))
+        self.assertEqual(self.sprite.rect.center, center)
+        self.assertEqual(self.sprite.mask.get_size(), (10, 20))
+
+    def test_left_right(self):
+        self.sprite.rotation_style = EngineSprite.LEFT_RIGHT
+        self.sprite.point_in_direction(45)
+        self.assertIs(self.sprite.surface,
+                      self.sprite.current_image.surface)
+        self.sprite.point_in_direction(180)
+        self.assertIsNot(self.sprite.surface,
+                         self.sprite.current_image.surface)
+        self.assertEqual(self.sprite.rect.size, (20, 10))
+
+    def test_invalid_style(self):
+        with self.assertRaises(ValueError):
+            self.sprite.rotation_style = "upside down"
+
+class TestToDisplayFormat(unittest.TestCase):
+
+    def setUp(self):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.display.init()
+
+    def tearDown(self):
+        pygame.display.quit()
+
+    def test_unchanged_without_display(self):
+        surface = pygame.Surface((4, 4))
+        self.assertIs(to_display_format(surface), surface)
+
+    def test_opaque(self):
+        display = pygame.display.set_mode((10, 10))
+        surface = to_display_format(pygame.Surface((4, 4), depth=8))
+        self.assertEqual(surface.get_bitsize(), display.get_bitsize())
+        self.assertFalse(surface.get_flags() & pygame.SRCALPHA)
+
+    def test_alpha_preserved(self):
+        pygame.display.set_mode((10, 10))
+        with TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "Disc.png")
+            save_disc_image(path)
+            image = Image(path)
+        self.assertTrue(image.surface.get_flags() & pygame.SRCALPHA)
+        self.assertEqual(image.mask.get_at((0, 0)), 0)
+        self.assertEqual(image.mask.get_at((10, 10)), 1)
+
+class TestAreTouching(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        scene = EngineScene()
+        scene.coordsys = CoordSys.get_system("topleft")(scene.topleft)
+        self.sprites = []
+        for name in ("A", "B"):
+            path = os.path.join(self.tmpdir.name, name)
+            os.mkdir(path)
+            save_disc_image(os.path.join(path, "Disc.png"))
+            sprite = EngineSprite(path, scene=scene)
+            sprite.images = [Image(os.path.join(path, "Disc.png"))]
+            sprite._index = 0
+            sprite.rect = sprite.current_image.rect.copy()
+            self.sprites.append(sprite)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_overlapping_pixels(self):
+        a, b = self.sprites
+        b.go_to(10, 0)
+        self.assertTrue(are_touching(a, b))
+
+    def test_only_transparent_corners_overlap(self):
+        a, b = self.sprites
+        b.go_to(17, 17)
+        self.assertTrue(a.rect.colliderect(b.rect))
+        self.assertFalse(are_touching(a, b))
+
+    def test_far_away(self):
+        a, b = self.sprites
+        b.go_to(100, 100)
+        self.assertFalse(are_touching(a, b))
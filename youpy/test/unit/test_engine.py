@@ -0,0 +1,727 @@
+# -*- encoding: utf-8 -*-
+"""
+"""
+
+
+import unittest
+import os
+from tempfile import TemporaryDirectory
+from types import SimpleNamespace
+from queue import Queue
+
+import pygame
+
+from youpy.data import EngineScene
+from youpy.data import EngineSprite
+from youpy.data import Image
+from youpy.math import CoordSys
+from youpy.engine import SpritesList
+from youpy.engine import TextCache
+from youpy.engine import FrameSnapshot
+from youpy.engine import RenderThread
+from youpy.engine import FrameRateGovernor
+from youpy.engine import Server
+from youpy.engine import RequestProcessors
+from youpy.engine import Simulation
+from youpy.engine import FrameJournal
+from youpy.engine import SharedVariablesRenderer
+from youpy.shared_variables import SharedVariableSet
+from youpy.test.unit._internal import booted_simulation
+from youpy.test.unit._internal import run_project
+from youpy.engine import TimerService
+from youpy.physics import PhysicalEngine
+from youpy.profiler import NullProfiler
+from youpy import message
+
+
+class SpritesListTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        scene = EngineScene()
+        scene.coordsys = CoordSys.get_system("topleft")(scene.topleft)
+        self.sprites = SpritesList()
+        for name in ("A", "B", "C"):
+            path = os.path.join(self.tmpdir.name, name)
+            os.mkdir(path)
+            image_path = os.path.join(path, "costume.png")
+            pygame.image.save(pygame.Surface((10, 10)), image_path)
+            sprite = EngineSprite(path, scene=scene)
+            sprite.images = [Image(image_path)]
+            sprite._index = 0
+            sprite.rect = sprite.current_image.rect.copy()
+            self.sprites.add(sprite)
+        self.a, self.b, self.c = self.sprites
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+class TestSpritesListBlitSequence(SpritesListTestCase):
+
+    def assertBlitOrder(self, sprites):
+        self.assertEqual([rect for _, rect in self.sprites.blit_sequence()],
+                         [sprite.rect for sprite in sprites])
+        for (_, rect), sprite in zip(self.sprites.blit_sequence(), sprites):
+            self.assertIs(rect, sprite.rect)
+
+    def test_back_to_front(self):
+        self.assertBlitOrder((self.a, self.b, self.c))
+
+    def test_cached_across_moves(self):
+        blits = self.sprites.blit_sequence()
+        self.a.go_to(5, 5)
+        self.assertIs(self.sprites.blit_sequence(), blits)
+
+    def test_visibility(self):
+        self.b.hide()
+        self.assertBlitOrder((self.a, self.c))
+        self.b.show()
+        self.assertBlitOrder((self.a, self.b, self.c))
+
+    def test_layers(self):
+        self.sprites.blit_sequence()
+        self.sprites.go_to_front_layer("A")
+        self.assertBlitOrder((self.b, self.c, self.a))
+        self.sprites.change_layer_by("A", -1)
+        self.assertBlitOrder((self.b, self.a, self.c))
+        self.sprites.go_to_back_layer("C")
+        self.assertBlitOrder((self.c, self.b, self.a))
+
+    def test_new_rect(self):
+        self.sprites.blit_sequence()
+        self.a.rect = pygame.Rect(0, 0, 4, 4)
+        self.assertBlitOrder((self.a, self.b, self.c))
+
+class TestSpritesListFindTopAt(SpritesListTestCase):
+
+    def test_top_most(self):
+        self.assertIs(self.sprites.find_top_at((5, 5)), self.c)
+        self.sprites.go_to_front_layer("A")
+        self.assertIs(self.sprites.find_top_at((5, 5)), self.a)
+
+    def test_moved(self):
+        self.a.go_to(20, 20)
+        self.assertIs(self.sprites.find_top_at((25, 25)), self.a)
+        self.assertIs(self.sprites.find_top_at((5, 5)), self.c)
+
+    def test_nothing(self):
+        self.assertIsNone(self.sprites.find_top_at((100, 100)))
+
+class TestTextCache(unittest.TestCase):
+
+    def setUp(self):
+        pygame.font.init()
+        self.font = pygame.font.Font(pygame.font.get_default_font(), 16)
+
+    def tearDown(self):
+        pygame.font.quit()
+
+    def test_cached(self):
+        cache = TextCache(self.font)
+        surface = cache.render("score = ")
+        self.assertIs(cache.render("score = "), surface)
+        self.assertEqual(surface.get_height(), self.font.get_height())
+
+    def test_bounded(self):
+        cache = TextCache(self.font, maxsize=2)
+        zero = cache.render("0")
+        cache.render("1")
+        cache.render("0") # most recently used
+        cache.render("2")
+        self.assertEqual(len(cache), 2)
+        self.assertIs(cache.render("0"), zero)
+
+
+class TestFrameSnapshot(unittest.TestCase):
+
+    def test_draw(self):
+        sprite = pygame.Surface((2, 2))
+        sprite.fill((255, 0, 0))
+        text = pygame.Surface((3, 1))
+        text.fill((0, 255, 0))
+        snapshot = FrameSnapshot(
+            backdrop=None,
+            sprites=((sprite, pygame.Rect(1, 1, 2, 2)),),
+            panels=((pygame.Rect(0, 4, 4, 1), ((text, (0, 4)),)),))
+        surface = pygame.Surface((5, 5))
+        surface.fill((0, 0, 255))
+        snapshot.draw(surface)
+        self.assertEqual(surface.get_at((0, 0)), (0, 0, 0, 255))
+        self.assertEqual(surface.get_at((2, 2)), (255, 0, 0, 255))
+        self.assertEqual(surface.get_at((2, 4)), (0, 255, 0, 255))
+        self.assertEqual(surface.get_at((3, 4)), (0, 0, 0, 255))
+
+class TestRenderThread(unittest.TestCase):
+
+    def test_take_frame(self):
+        display = pygame.Surface((4, 4))
+        display.fill((0, 0, 255))
+        sprite = pygame.Surface((2, 2))
+        sprite.fill((255, 0, 0))
+        render_thread = RenderThread(display)
+        self.assertIsNone(render_thread.take_frame())
+        render_thread.start()
+        render_thread.publish(FrameSnapshot(
+            backdrop=None, sprites=((sprite, pygame.Rect(0, 0, 2, 2)),),
+            panels=()))
+        render_thread.stop()
+        self.assertTrue(render_thread.has_frame)
+        frame = render_thread.take_frame()
+        self.assertFalse(render_thread.has_frame)
+        self.assertIsNone(render_thread.take_frame())
+        # Composed offscreen: the display surface is left untouched.
+        self.assertEqual(display.get_at((0, 0)), (0, 0, 255, 255))
+        self.assertEqual(frame.get_at((0, 0)), (255, 0, 0, 255))
+        self.assertEqual(frame.get_at((3, 3)), (0, 0, 0, 255))
+
+
+class TestHaltWithFailedRenderThread(unittest.TestCase):
+
+    def setUp(self):
+        pygame.init()
+        self.simu = Simulation(project=None)
+        self.simu._render_thread = RenderThread(pygame.Surface((4, 4)))
+        self.simu._render_thread.start()
+        # Drawing this snapshot fails.
+        self.simu._render_thread.publish(FrameSnapshot(
+            backdrop=None, sprites=((None, None),), panels=()))
+
+    def test_halt(self):
+        with self.assertRaisesRegex(RuntimeError, "render thread failed"):
+            self.simu.halt()
+        self.assertFalse(pygame.get_init())
+
+    def test_halt_on_error(self):
+        # The error we halt because of is not hidden.
+        with self.assertRaises(KeyError):
+            try:
+                raise KeyError("boom")
+            finally:
+                self.simu.halt()
+        self.assertFalse(pygame.get_init())
+
+
+class TestFrameRateGovernor(unittest.TestCase):
+
+    def run_frames(self, governor, count, load, pending_requests=0):
+        for _ in range(count):
+            governor.frame_done(load * governor.frame_time, pending_requests)
+
+    def test_lower_under_load(self):
+        governor = FrameRateGovernor(40)
+        self.run_frames(governor, 200, load=2)
+        self.assertEqual(governor.fps, 10)
+        self.assertGreater(governor.stats.lowered_count, 0)
+
+    def test_lower_when_requests_pile_up(self):
+        governor = FrameRateGovernor(40)
+        self.run_frames(governor, 1, load=0,
+                        pending_requests=FrameRateGovernor.MAX_PENDING_REQUESTS + 1)
+        self.assertLess(governor.fps, 40)
+
+    def test_raise_with_slack(self):
+        governor = FrameRateGovernor(40)
+        self.run_frames(governor, 200, load=2)
+        self.run_frames(governor, 500, load=0.1)
+        self.assertEqual(governor.fps, 40)
+        self.assertGreater(governor.stats.raised_count, 0)
+
+    def test_not_adaptive(self):
+        governor = FrameRateGovernor(40, adaptive=False)
+        self.run_frames(governor, 200, load=2)
+        self.assertEqual(governor.fps, 40)
+        self.assertGreater(governor.stats.load, 1)
+
+    def test_dropped_steps(self):
+        governor = FrameRateGovernor(40)
+        governor.steps_dropped(3)
+        governor.steps_dropped(2)
+        self.assertEqual(governor.stats.capped_frames, 2)
+        self.assertEqual(governor.stats.dropped_steps, 5)
+
+class TestTimerService(unittest.TestCase):
+
+    def test_advance(self):
+        timers = TimerService()
+        fired = []
+        for deadline in (3, 1, 2, 1):
+            timers.call_at(deadline, lambda d=deadline: fired.append(d))
+        timers.advance(1)
+        self.assertEqual(fired, [])
+        timers.advance(2.5)
+        self.assertEqual(fired, [1, 1, 2])
+        timers.advance(10)
+        self.assertEqual(fired, [1, 1, 2, 3])
+
+    def test_call_later(self):
+        timers = TimerService()
+        timers.advance(5)
+        fired = []
+        timers.call_later(1, lambda: fired.append(timers.time))
+        timers.advance(6.5)
+        self.assertEqual(fired, [6.5])
+
+    def test_expired_deadline(self):
+        timers = TimerService()
+        timers.advance(5)
+        fired = []
+        timers.call_at(1, lambda: fired.append(1))
+        self.assertEqual(fired, [1])
+
+    def test_cancel(self):
+        timers = TimerService()
+        fired = []
+        timer = timers.call_at(1, lambda: fired.append(1))
+        timers.call_at(2, lambda: fired.append(2))
+        timer.cancel()
+        timers.advance(3)
+        self.assertEqual(fired, [2])
+
+class FakeScript:
+
+    def __init__(self, name="Sprite_when_program_start"):
+        self.name = name
+        self.pipe = SimpleNamespace(reply_queue=Queue())
+
+class FakeScripts:
+
+    def __init__(self):
+        self.requests = []
+
+    def iter_requests(self):
+        requests, self.requests = self.requests, []
+        return iter(requests)
+
+class TestServer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        scene = EngineScene()
+        scene.coordsys = CoordSys.get_system("topleft")(scene.topleft)
+        path = os.path.join(self.tmpdir.name, "Sprite")
+        os.mkdir(path)
+        sprite = EngineSprite(path, scene=scene)
+        sprite.rect = pygame.Rect(0, 0, 10, 10)
+        self.sprites = SpritesList()
+        self.sprites.add(sprite)
+        self.physics = PhysicalEngine(delta_time=0.01)
+        self.simu = SimpleNamespace(
+            profiler=NullProfiler(), scripts=FakeScripts(),
+            sprites=self.sprites, _physical_engine=self.physics,
+            timers=TimerService(), time=0)
+        self.server = Server(self.simu)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def post(self, script, request, wants_reply=True):
+        self.simu.scripts.requests.append((script, request, wants_reply))
+
+    def step(self):
+        self.physics.step()
+        self.simu.time = self.physics.time
+        self.simu.timers.advance(self.simu.time)
+        self.server.process_requests()
+
+    def test_drain(self):
+        script = FakeScript()
+        self.post(script, message.SpriteOp("Sprite", "hide"),
+                  wants_reply=False)
+        self.post(script, message.SpriteOp("Sprite", "show"),
+                  wants_reply=False)
+        self.post(script, message.Sync())
+        self.server.process_requests()
+        # All queued one-shot requests are served within the same call.
+        self.assertIsNone(script.pipe.reply_queue.get(block=False))
+        self.assertTrue(script.pipe.reply_queue.empty())
+        self.assertEqual(self.server.pending_count, 0)
+
+    def test_wait(self):
+        scripts = [FakeScript() for _ in range(3)]
+        for script, delay in zip(scripts, (0.05, 0.015, 0.03)):
+            self.post(script, message.Wait(delay))
+        self.server.process_requests()
+        replied = []
+        for _ in range(6):
+            self.step()
+            replied.append([not script.pipe.reply_queue.empty()
+                            for script in scripts])
+        self.assertEqual(replied, [
+            [False, False, False],
+            [False, True, False],
+            [False, True, False],
+            [False, True, True],
+            [False, True, True],
+            [True, True, True],
+        ])
+
+    def test_move(self):
+        script = FakeScript()
+        self.post(script, message.SpriteMoveTo("Sprite", (20, 0), 0.02))
+        self.post(script, message.Sync())
+        self.server.process_requests()
+        self.step()
+        self.assertTrue(script.pipe.reply_queue.empty())
+        self.step()
+        self.assertIsNone(script.pipe.reply_queue.get(block=False))
+        # The next request is served as soon as the move is done.
+        self.assertIsNone(script.pipe.reply_queue.get(block=False))
+        self.assertEqual(self.server.waiting_scripts_count, 0)
+
+    def test_post(self):
+        script = FakeScript()
+        sprite = self.sprites.by_name("Sprite")
+        self.post(script, message.SpriteOp("Sprite", "hide"),
+                  wants_reply=False)
+        self.server.process_requests()
+        self.assertFalse(sprite.visible)
+        # Posted requests are never replied.
+        self.assertTrue(script.pipe.reply_queue.empty())
+        self.assertEqual(self.server.waiting_scripts_count, 0)
+
+    def test_deferred_error(self):
+        script = FakeScript()
+        sprite = self.sprites.by_name("Sprite")
+        self.post(script, message.SpriteOp("Sprite", "no_such_op"),
+                  wants_reply=False)
+        # Discarded since posted after a failed request.
+        self.post(script, message.SpriteOp("Sprite", "hide"),
+                  wants_reply=False)
+        self.post(script, message.Sync())
+        self.post(script, message.Sync())
+        self.server.process_requests()
+        # The error is reported by the first request waiting for a reply...
+        self.assertIsInstance(script.pipe.reply_queue.get(block=False),
+                              AttributeError)
+        self.assertTrue(sprite.visible)
+        # ... and only once.
+        self.assertIsNone(script.pipe.reply_queue.get(block=False))
+        self.assertTrue(script.pipe.reply_queue.empty())
+
+    def test_deferred_error_after_move(self):
+        script = FakeScript()
+        self.post(script, message.SpriteMoveTo("Sprite", (20, 0), 0.02),
+                  wants_reply=False)
+        self.post(script, message.SpriteOp("Sprite", "no_such_op"),
+                  wants_reply=False)
+        self.post(script, message.Sync())
+        self.server.process_requests()
+        self.step()
+        self.assertTrue(script.pipe.reply_queue.empty())
+        self.step()
+        # The failed request is run once the move is done.
+        self.assertIsInstance(script.pipe.reply_queue.get(block=False),
+                              AttributeError)
+
+    def test_forget_waiting_script(self):
+        script = FakeScript()
+        self.post(script, message.SpriteMoveTo("Sprite", (20, 0), 0.02))
+        self.post(script, message.Sync())
+        self.server.process_requests()
+        self.assertEqual(self.server.waiting_scripts_count, 1)
+        self.server.forget([script])
+        self.assertEqual(self.server.waiting_scripts_count, 0)
+        self.assertEqual(self.server.pending_count, 0)
+        # The move goes on but nobody is waiting for it anymore.
+        self.step()
+        self.step()
+        self.assertTrue(script.pipe.reply_queue.empty())
+
+    def test_forget_logs_deferred_error(self):
+        script = FakeScript()
+        self.post(script, message.SpriteOp("Sprite", "no_such_op"),
+                  wants_reply=False)
+        self.server.process_requests()
+        with self.assertLogs("youpy.engine", level="ERROR") as cm:
+            self.server.forget([script])
+        self.assertIn(script.name, cm.output[0])
+        self.assertIn("no_such_op", cm.output[0])
+
+class TestSpriteTouching(unittest.TestCase):
+
+    def touching(self, simu, name, *targets):
+        proc = RequestProcessors.new(
+            simu, None, message.SpriteTouching(name=name, targets=targets))
+        proc()
+        self.assertTrue(proc.is_finished)
+        return proc.reply
+
+    def test_sprites(self):
+        with booted_simulation({"A": "", "B": ""}) as simu:
+            a = simu.sprites.by_name("A")
+            b = simu.sprites.by_name("B")
+            a.go_to(0, 0)
+            b.go_to(5, 0)
+            self.assertEqual(self.touching(simu, "A", "B"), (True,))
+            b.go_to(20, 0)
+            self.assertEqual(self.touching(simu, "A", "B"), (False,))
+
+    def test_transparent_pixels(self):
+        with booted_simulation({"A": "", "B": ""}) as simu:
+            a = simu.sprites.by_name("A")
+            b = simu.sprites.by_name("B")
+            # Only the left half of A is opaque.
+            surface = pygame.Surface((10, 10), pygame.SRCALPHA)
+            surface.fill((255, 0, 0, 255), pygame.Rect(0, 0, 5, 10))
+            a.current_image.surface = surface
+            a.go_to(0, 0)
+            b.go_to(7, 0)
+            self.assertTrue(a.rect.colliderect(b.rect))
+            self.assertEqual(self.touching(simu, "A", "B"), (False,))
+            b.go_to(3, 0)
+            self.assertEqual(self.touching(simu, "A", "B"), (True,))
+
+    def test_edge_and_unknown_sprite(self):
+        with booted_simulation({"A": "", "B": ""}) as simu:
+            a = simu.sprites.by_name("A")
+            b = simu.sprites.by_name("B")
+            a.go_to(240, 180)
+            b.go_to(240, 180)
+            edge = simu.scene.EDGE
+            self.assertEqual(self.touching(simu, "A", edge, "Nobody", "B"),
+                             (False, False, True))
+            a.go_to(1000, 0)
+            self.assertEqual(self.touching(simu, "A", edge, "Nobody", "B"),
+                             (True, False, False))
+
+    def test_frontend(self):
+        script = """
+from youpy.code.english.everything import *
+
+def when_program_start():
+    go_to(0, 0)
+    wait(0.1) # let B go to its place
+    shared_variable.at_center = touching_each("B", "Nobody", Stage.edge)
+    shared_variable.touching_nobody = touching("Nobody")
+    go_to(1000, 0)
+    shared_variable.outside = touching_each("B", Stage.edge)
+    try:
+        touching(42)
+    except TypeError:
+        shared_variable.type_error = True
+    stop_program()
+"""
+        simu = run_project({
+            "A": script,
+            "B": "from youpy.code.english.everything import *\n"
+                 "def when_program_start():\n"
+                 "    go_to(5, 0)\n",
+        })
+        values = {name: simu.shared_variables[name].get()
+                  for name in ("at_center", "touching_nobody", "outside",
+                               "type_error")}
+        self.assertEqual(values, {
+            "at_center": (True, False, False),
+            "touching_nobody": False,
+            "outside": (False, True),
+            "type_error": True,
+        })
+
+class TestSimulation(unittest.TestCase):
+
+    def test_invalid_delta_time(self):
+        with self.assertRaises(ValueError):
+            Simulation(project=None, delta_time=0)
+
+    def test_publish_sprite_states(self):
+        with booted_simulation({"A": "", "B": ""}) as simu:
+            a = simu.sprites.by_name("A")
+            b = simu.sprites.by_name("B")
+            simu.simulate()
+            b_state = b.state
+            self.assertIsNotNone(b_state)
+            a.go_to(10, 20)
+            self.assertIsNone(a.state)
+            simu.simulate()
+            self.assertEqual((a.state.version, a.state.position),
+                             (a.version, (10, 20)))
+            # Unchanged sprites keep their snapshot.
+            self.assertIs(b.state, b_state)
+
+class TestUnthrottledEngine(unittest.TestCase):
+
+    def run_busy_project(self, busy_time):
+        """Run a project where A spends _busy_time_ wall-clock seconds
+        running user code between its moves, while B keeps moving.
+        """
+        script = f"""
+import time
+from youpy.code.english.everything import *
+
+def when_program_start():
+    go_to(0, 0)
+    for _ in range(4):
+        move(10)
+        time.sleep({busy_time})
+    stop_program()
+"""
+        simu = run_project({
+            "A": script,
+            "B": "from youpy.code.english.everything import *\n"
+                 "def when_program_start():\n"
+                 "    go_to(0, 0)\n"
+                 "    while True:\n"
+                 "        move(1)\n",
+        })
+        return (simu.time, simu.sprites.by_name("A").position.tuple,
+                simu.sprites.by_name("B").position.tuple)
+
+    def test_results_do_not_depend_on_wall_clock(self):
+        results = self.run_busy_project(0)
+        # Longer than any step, so the simulated time would have advanced
+        # meanwhile if the engine did not wait for A.
+        self.assertEqual(self.run_busy_project(0.06), results)
+        self.assertEqual(self.run_busy_project(0), results)
+
+class TestFrameJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.shared_variables = SharedVariableSet()
+        self.journal = FrameJournal(self.shared_variables)
+
+    def test_empty(self):
+        self.assertTrue(self.journal.is_empty)
+
+    def test_sprite_changed(self):
+        sprite = object()
+        self.journal.sprite_changed(sprite)
+        self.assertFalse(self.journal.is_empty)
+        self.assertEqual(self.journal.changed_sprites, {sprite})
+        self.journal.clear()
+        self.assertTrue(self.journal.is_empty)
+        self.assertEqual(self.journal.changed_sprites, set())
+
+    def test_backdrop_switched(self):
+        self.journal.backdrop_switched()
+        self.assertFalse(self.journal.is_empty)
+        self.journal.clear()
+        self.assertTrue(self.journal.is_empty)
+
+    def test_shared_variables_changed(self):
+        self.shared_variables["x"] = 1
+        self.assertTrue(self.journal.shared_variables_updated)
+        # Only cleared once the variables are read for rendering.
+        self.journal.clear()
+        self.assertFalse(self.journal.is_empty)
+        self.shared_variables.clear_change_flag()
+        self.assertTrue(self.journal.is_empty)
+
+class TestNeedsRender(unittest.TestCase):
+
+    def test_skip_unchanged_frames(self):
+        with booted_simulation({"A": ""}) as simu:
+            self.assertTrue(simu.needs_render) # first frame
+            simu.render()
+            self.assertFalse(simu.needs_render)
+            simu.render()
+            self.assertFalse(simu.needs_render)
+            sprite = simu.sprites.by_name("A")
+            sprite.go_to(5, 5)
+            self.assertTrue(simu.needs_render)
+            simu.render()
+            self.assertFalse(simu.needs_render)
+            simu.shared_variables["x"] = 1
+            simu.shared_variables["x"].show()
+            self.assertTrue(simu.needs_render)
+            simu.render()
+            self.assertFalse(simu.needs_render)
+
+    def test_shared_variable_changed_while_rendering(self):
+        with booted_simulation({"A": ""}) as simu:
+            simu.shared_variables["x"] = 1
+            simu.shared_variables["x"].show()
+            update = SharedVariablesRenderer._update
+            def changing_update(renderer, shared_variables):
+                update(renderer, shared_variables)
+                # Changed by a request while the variables are read.
+                shared_variables["x"] += 1
+            renderer = simu._renderer._shared_variables_renderer
+            renderer._update = changing_update.__get__(renderer)
+            simu.render()
+            del renderer._update
+            self.assertTrue(simu.needs_render)
+            simu.render()
+            self.assertFalse(simu.needs_render)
+
+class TestRendererInterpolation(unittest.TestCase):
+
+    def test_interpolate(self):
+        with booted_simulation({"A": "", "B": ""}, interpolate=True) as simu:
+            a = simu.sprites.by_name("A")
+            b = simu.sprites.by_name("B")
+            a.go_to(100, 100)
+            b.go_to(200, 100)
+            physics = simu._physical_engine
+            physics.move_sprite_to(a, (120, 100), duration=0.01)
+            physics.move_sprite_to(b, (220, 100), duration=0.01)
+            simu.simulate()
+            displayed = simu._renderer._interpolate(0.5)
+            self.assertEqual(displayed[a].center, (110, 100))
+            self.assertEqual(displayed[b].center, (210, 100))
+            # Teleported after the step: not displayed on its way.
+            b.go_to(0, 0)
+            displayed = simu._renderer._interpolate(0.5)
+            self.assertEqual(displayed[a].center, (110, 100))
+            self.assertNotIn(b, displayed)
+
+class TestRendererDirtyAreas(unittest.TestCase):
+    """Rendering only the dirty areas must draw the same pixels as redrawing
+    the whole scene.
+    """
+
+    def assert_same_as_full_render(self, simu, dirty=True):
+        renderer = simu._renderer
+        renderer.render()
+        if dirty:
+            self.assertIsNotNone(renderer.updated_rects)
+        else:
+            self.assertIsNone(renderer.updated_rects)
+        scene = simu.scene
+        rendered = scene.surface
+        reference = pygame.Surface(rendered.get_size(), 0, rendered)
+        # Do not let the full render fix the renderer's state.
+        drawn = dict(renderer._drawn)
+        scene.surface = reference
+        try:
+            renderer._render_all(scene, simu.sprites)
+        finally:
+            scene.surface = rendered
+            renderer._drawn = drawn
+        self.assertEqual(pygame.image.tobytes(rendered, "RGB"),
+                         pygame.image.tobytes(reference, "RGB"))
+
+    def test_changes(self):
+        with booted_simulation({"A": "", "B": "", "C": ""}) as simu:
+            a, b, c = (simu.sprites.by_name(name) for name in "ABC")
+            simu.shared_variables["score"] = 1
+            simu.shared_variables["score"].show()
+            self.assert_same_as_full_render(simu, dirty=False)
+            # Nothing changed.
+            self.assert_same_as_full_render(simu)
+            self.assertEqual(simu._renderer.updated_rects, [])
+            # Move over another sprite.
+            a.go_to(b.position.x + 4, b.position.y + 3)
+            self.assert_same_as_full_render(simu)
+            b.hide()
+            self.assert_same_as_full_render(simu)
+            b.show()
+            c.go_to(100, 80)
+            self.assert_same_as_full_render(simu)
+            # Re-layer overlapping sprites.
+            simu.sprites.go_to_back_layer("A")
+            self.assert_same_as_full_render(simu)
+            simu.sprites.go_to_front_layer("A")
+            self.assert_same_as_full_render(simu)
+            # Rotate: the rect size changes.
+            a.rotation_style = a.ALL_AROUND
+            a.point_in_direction(30)
+            self.assert_same_as_full_render(simu)
+            # Move under the shared variables panel, which grows.
+            c.go_to(-235, 175)
+            simu.shared_variables["score"] += 1000
+            self.assert_same_as_full_render(simu)
+            # Too many dirty areas: redraw everything.
+            simu._renderer.MAX_DIRTY_RECTS = 1
+            b.go_to(-100, -100)
+            c.go_to(100, 100)
+            self.assert_same_as_full_render(simu, dirty=False)
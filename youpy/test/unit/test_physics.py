@@ -0,0 +1,174 @@
+# -*- encoding: utf-8 -*-
+"""
+"""
+
+
+import unittest
+import os
+from tempfile import TemporaryDirectory
+
+import pygame
+
+from youpy.data import EngineScene
+from youpy.data import EngineSprite
+from youpy.math import CoordSys
+from youpy.math import Point
+from youpy.physics import PhysicalEngine
+from youpy.physics import numpy
+
+
+class PhysicsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.scene = EngineScene()
+        self.scene.coordsys = CoordSys.get_system("topleft")(self.scene.topleft)
+        self.sprite = self.make_sprite("Sprite")
+
+    def make_sprite(self, name):
+        path = os.path.join(self.tmpdir.name, name)
+        os.mkdir(path)
+        sprite = EngineSprite(path, scene=self.scene)
+        sprite.rect = pygame.Rect(0, 0, 10, 10)
+        return sprite
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+class TestPhysicalEngine(PhysicsTestCase):
+
+    def test_invalid_delta_time(self):
+        for delta_time in (0, -0.01, float("nan")):
+            with self.assertRaises(ValueError):
+                PhysicalEngine(delta_time=delta_time)
+
+    def test_last_moves(self):
+        engine = PhysicalEngine(delta_time=0.01)
+        engine.move_sprite_to(self.sprite, (20, 0), duration=0.02)
+        engine.step()
+        self.assertEqual(engine.last_moves,
+                         {self.sprite: (0, 0, self.sprite.version)})
+        engine.step()
+        self.assertEqual(engine.last_moves,
+                         {self.sprite: (10, 0, self.sprite.version)})
+        self.assertEqual(self.sprite.position, Point(20, 0))
+        engine.step()
+        self.assertEqual(engine.last_moves, {})
+
+    def test_last_moves_of_sprite_moved_twice(self):
+        modes = [False] if numpy is None else [False, True]
+        for vectorized in modes:
+            sprite = self.make_sprite(f"Sprite{vectorized}")
+            engine = PhysicalEngine(delta_time=0.01, vectorized=vectorized)
+            engine.move_sprite_to(sprite, (40, 0), duration=0.04)
+            engine.move_sprite_to(sprite, (0, 40), duration=0.01)
+            engine.step()
+            # From where it was before the step, as it is after the step.
+            self.assertEqual(engine.last_moves,
+                             {sprite: (0, 0, sprite.version)})
+
+    def test_move_sprite(self):
+        engine = PhysicalEngine(delta_time=0.01)
+        self.sprite.point_in_direction(0)
+        system = engine.move_sprite(self.sprite, 10, duration=0.03)
+        for _ in range(3):
+            self.assertFalse(system.is_finished)
+            engine.step()
+        self.assertTrue(system.is_finished)
+        self.assertEqual(self.sprite.position, Point(10, 0))
+        self.assertEqual(self.sprite.rect.topleft, (10, 0))
+
+    def test_when_finished(self):
+        engine = PhysicalEngine(delta_time=0.01)
+        finished = []
+        system = engine.move_sprite_to(self.sprite, (20, 0), duration=0.02)
+        system.when_finished(finished.append)
+        engine.step()
+        self.assertEqual(finished, [])
+        engine.step()
+        self.assertEqual(finished, [system])
+        engine.step()
+        self.assertEqual(finished, [system])
+        # Called right away when already finished.
+        system.when_finished(finished.append)
+        self.assertEqual(finished, [system, system])
+
+    def test_null_move(self):
+        engine = PhysicalEngine(delta_time=0.01)
+        system = engine.move_sprite(self.sprite, 0)
+        self.assertTrue(system.is_finished)
+        engine.step()
+        self.assertEqual(self.sprite.position, Point(0, 0))
+        self.assertEqual(engine.last_moves, {})
+
+    def test_move_sprite_by(self):
+        engine = PhysicalEngine(delta_time=0.01)
+        velocity = Point(20, 0)
+        system = engine.move_sprite_by(self.sprite, velocity, duration=0.04)
+        self.assertEqual(velocity, Point(20, 0))
+        engine.step()
+        engine.step()
+        self.assertEqual(self.sprite.position, Point(10, 0))
+        engine.step()
+        engine.step()
+        self.assertTrue(system.is_finished)
+        self.assertEqual(self.sprite.position, Point(20, 0))
+
+    def test_step_longer_than_move(self):
+        engine = PhysicalEngine(delta_time=0.1)
+        system = engine.move_sprite_to(self.sprite, (20, 0))
+        engine.step()
+        self.assertTrue(system.is_finished)
+        self.assertEqual(self.sprite.position, Point(20, 0))
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class TestVectorizedPhysicalEngine(PhysicsTestCase):
+
+    def test_same_as_systems(self):
+        trajectories = []
+        for vectorized in (False, True):
+            sprites = [self.make_sprite(f"S{vectorized}{i}") for i in range(3)]
+            engine = PhysicalEngine(delta_time=0.01, vectorized=vectorized)
+            moves = [engine.move_sprite_to(sprite, (7 * i + 3, -5 * i),
+                                           duration=0.05 * (i + 1))
+                     for i, sprite in enumerate(sprites)]
+            finished = []
+            for move in moves:
+                move.when_finished(finished.append)
+            trajectory = []
+            for _ in range(20):
+                engine.step()
+                trajectory.append(
+                    ([sprite.position.tuple for sprite in sprites],
+                     [tuple(sprite.rect) for sprite in sprites],
+                     [move.is_finished for move in moves],
+                     [moves.index(move) for move in finished]))
+            trajectories.append(trajectory)
+        self.assertEqual(trajectories[0], trajectories[1])
+
+    def test_grow(self):
+        engine = PhysicalEngine(delta_time=0.01, vectorized=True)
+        sprites = [self.make_sprite(f"S{i}") for i in range(100)]
+        for i, sprite in enumerate(sprites):
+            engine.move_sprite_to(sprite, (i, 2 * i),
+                                  duration=0.01 * (i % 3 + 1))
+        for _ in range(3):
+            engine.step()
+        self.assertEqual([sprite.position.tuple for sprite in sprites],
+                         [(i, 2 * i) for i in range(100)])
+        # Only the moves lasting 3 steps were still running.
+        self.assertEqual({sprite: version for sprite, (_, _, version)
+                          in engine.last_moves.items()},
+                         {sprite: sprite.version
+                          for i, sprite in enumerate(sprites) if i % 3 == 2})
+
+    def test_moved_elsewhere(self):
+        engine = PhysicalEngine(delta_time=0.01, vectorized=True)
+        engine.move_sprite_to(self.sprite, (40, 0), duration=0.04)
+        engine.move_sprite_to(self.sprite, (0, 40), duration=0.04)
+        engine.step()
+        # Both moves are applied.
+        self.assertEqual(self.sprite.position, Point(10, 10))
+        self.sprite.go_to(100, 100)
+        engine.step()
+        self.assertEqual(self.sprite.position, Point(110, 110))
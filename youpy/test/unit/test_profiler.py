@@ -0,0 +1,68 @@
+# -*- encoding: utf-8 -*-
+"""
+"""
+
+
+import unittest
+import io
+import csv
+import json
+
+from youpy.profiler import FrameProfiler
+from youpy.profiler import NullProfiler
+
+
+class TestFrameProfiler(unittest.TestCase):
+
+    def test_phases_summed_per_frame(self):
+        profiler = FrameProfiler()
+        for _ in range(3):
+            with profiler.measure("physics"):
+                pass
+        profiler.end_frame()
+        profiler.end_frame()
+        self.assertEqual(len(profiler), 2)
+        first, second = profiler
+        physics = profiler.columns.index("physics")
+        self.assertGreater(first[physics], 0)
+        self.assertEqual(second[physics], 0)
+        self.assertEqual((first[0], second[0]), (0, 1))
+
+    def test_ring_buffer(self):
+        profiler = FrameProfiler(capacity=2)
+        for _ in range(5):
+            profiler.end_frame()
+        self.assertEqual([frame[0] for frame in profiler], [3, 4])
+
+    def test_averages(self):
+        profiler = FrameProfiler()
+        self.assertEqual(profiler.averages()["render"], 0)
+        with profiler.measure("render"):
+            pass
+        profiler.end_frame()
+        profiler.end_frame()
+        self.assertGreater(profiler.averages()["render"], 0)
+        self.assertEqual(profiler.averages(count=1)["render"], 0)
+
+    def test_export(self):
+        profiler = FrameProfiler()
+        profiler.end_frame()
+        stream = io.StringIO()
+        profiler.write_csv(stream)
+        rows = list(csv.reader(io.StringIO(stream.getvalue())))
+        self.assertEqual(tuple(rows[0]), profiler.columns)
+        self.assertEqual(len(rows), 2)
+        stream = io.StringIO()
+        profiler.write_json(stream)
+        frames = json.loads(stream.getvalue())
+        self.assertEqual(frames[0]["frame"], 0)
+        self.assertEqual(set(frames[0]), set(profiler.columns))
+
+class TestNullProfiler(unittest.TestCase):
+
+    def test_measure_nothing(self):
+        profiler = NullProfiler()
+        with profiler.measure("render"):
+            pass
+        profiler.end_frame()
+        self.assertFalse(profiler.enabled)
@@ -0,0 +1,79 @@
+# -*- encoding: utf-8 -*-
+"""
+"""
+
+
+import unittest
+import os
+from tempfile import TemporaryDirectory
+from types import SimpleNamespace
+
+import pygame
+
+from youpy.data import EngineScene
+from youpy.data import EngineSprite
+from youpy.math import CoordSys
+from youpy.script import Script
+from youpy.script import Sprite
+from youpy import message
+
+
+class TestSpriteGetState(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        path = os.path.join(self.tmpdir.name, "A")
+        os.mkdir(path)
+        scene = EngineScene()
+        scene.coordsys = CoordSys.get_system("topleft")(scene.topleft)
+        self.engine_sprite = EngineSprite(path, scene=scene)
+        self.engine_sprite.rect = pygame.Rect(0, 0, 10, 10)
+        self.engine_sprite.go_to(1, 2)
+        self.sprite = Sprite(self.engine_sprite)
+        # Never started: requests are read and replied by the test.
+        self.script = Script(SimpleNamespace(name="A_when_program_start"))
+        Script.context.script = self.script
+
+    def tearDown(self):
+        del Script.context.script
+        self.tmpdir.cleanup()
+
+    def reply_state(self):
+        """Reply to the next get_state request ahead of time."""
+        self.script.pipe.reply_queue.put(self.engine_sprite.get_state())
+
+    def sent_requests(self):
+        queue = self.script.pipe.request_queue
+        requests = []
+        while not queue.empty():
+            _, request, _ = queue.get()
+            requests.append(request)
+        return requests
+
+    def test_published_state(self):
+        self.engine_sprite.get_state()
+        self.assertEqual(self.sprite.position(), (1, 2))
+        self.assertEqual(self.sent_requests(), [])
+
+    def test_outdated_state(self):
+        state = self.engine_sprite.get_state()
+        self.engine_sprite.go_to(3, 4)
+        self.assertIsNone(self.engine_sprite.state)
+        self.script.pipe.reply_queue.put(state._replace(x=3, y=4))
+        self.assertEqual(self.sprite.position(), (3, 4))
+        self.assertEqual(self.sent_requests(),
+                         [message.SpriteOp(name="A", op="get_state")])
+
+    def test_posted_requests(self):
+        self.engine_sprite.get_state()
+        self.assertFalse(self.script.has_posted_requests)
+        self.script.post(message.SpriteOp(name="A", op="hide"))
+        self.assertTrue(self.script.has_posted_requests)
+        # The engine may not have processed the posted request yet.
+        self.reply_state()
+        self.assertEqual(self.sprite.position(), (1, 2))
+        self.assertFalse(self.script.has_posted_requests)
+        self.assertEqual(self.sent_requests(), [
+            message.SpriteOp(name="A", op="hide"),
+            message.SpriteOp(name="A", op="get_state"),
+        ])
@@ -0,0 +1,57 @@
+# -*- encoding: utf-8 -*-
+"""
+"""
+
+
+import unittest
+
+from pygame import Rect
+
+from youpy.spatial import UniformGrid
+
+
+class TestUniformGrid(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = UniformGrid(cell_size=10)
+
+    def test_query_rect(self):
+        self.grid.insert("a", Rect(0, 0, 5, 5))
+        self.grid.insert("b", Rect(25, 25, 5, 5))
+        self.assertEqual(self.grid.query_rect(Rect(2, 2, 5, 5)), {"a"})
+        self.assertEqual(self.grid.query_rect(Rect(0, 0, 30, 30)), {"a", "b"})
+        self.assertEqual(self.grid.query_rect(Rect(50, 50, 5, 5)), set())
+
+    def test_right_edge_excluded(self):
+        # Spans [0, 10[ thus only the first cell.
+        self.grid.insert("a", Rect(0, 0, 10, 10))
+        self.assertEqual(self.grid.query_rect(Rect(10, 0, 5, 5)), set())
+
+    def test_spanning_multiple_cells(self):
+        self.grid.insert("a", Rect(5, 5, 20, 20))
+        self.assertEqual(self.grid.query_point((21, 21)), {"a"})
+        self.assertEqual(self.grid.query_point((21, 1)), {"a"})
+        self.assertEqual(self.grid.query_point((31, 1)), set())
+
+    def test_negative_coordinates(self):
+        self.grid.insert("a", Rect(-15, -15, 5, 5))
+        self.assertEqual(self.grid.query_point((-12, -12)), {"a"})
+        self.assertEqual(self.grid.query_point((2, 2)), set())
+
+    def test_update(self):
+        self.grid.insert("a", Rect(0, 0, 5, 5))
+        self.grid.update("a", Rect(40, 40, 5, 5))
+        self.assertEqual(self.grid.query_point((1, 1)), set())
+        self.assertEqual(self.grid.query_point((41, 41)), {"a"})
+
+    def test_remove(self):
+        self.grid.insert("a", Rect(0, 0, 5, 5))
+        self.grid.remove("a")
+        self.assertNotIn("a", self.grid)
+        self.assertEqual(len(self.grid), 0)
+        self.assertEqual(self.grid.query_point((1, 1)), set())
+
+    def test_insert_twice(self):
+        self.grid.insert("a", Rect(0, 0, 5, 5))
+        with self.assertRaises(ValueError):
+            self.grid.insert("a", Rect(0, 0, 5, 5))
@@ -35,6 +35,8 @@ def rev_dict(d):
 
 class FrequencyMeter:
 
+    PERIOD = 1.0 # sec
+
     def __init__(self):
         self._count = 0
         self._frequency = 0.0
@@ -44,7 +46,7 @@ class FrequencyMeter:
     def update(self):
         t = time.time()
         duration = (t - self._last_updated_at)
-        if duration > 1.0: # sec
+        if duration > self.PERIOD:
             self._frequency = self._count / duration
             self._count = 0
             self._last_updated_at = t
@@ -62,6 +64,11 @@ class FrequencyMeter:
     def updated(self):
         return self._updated
 
+    @property
+    def is_outdated(self):
+        """Whether the next call to update() will compute a new frequency."""
+        return time.time() - self._last_updated_at > self.PERIOD
+
     def __str__(self):
         return f"{self._frequency:.2f}"
 